@@ -8,7 +8,7 @@ from PyQt6.QtGui import QIcon, QPixmap, QPainter
 from PyQt6.QtCore import Qt, pyqtSignal, QSettings, QTimer
 from .hotkey_manager import create_hotkey_manager, HotkeyManager
 from .tools import *
-from .settings import SettingsDialog, load_and_validate_settings, save_settings_to_file
+from .settings import SettingsDialog, load_and_validate_settings, save_settings_to_file, read_all_settings
 from .input import InputDialog
 
 # Import plugin system
@@ -104,6 +104,7 @@ class TrayInputApp(QApplication):
                 pass
         if dialog.exec() == QDialog.DialogCode.Accepted:
             logger.info("Settings accepted, restarting hotkey")
+            self.input_dialog._reload_cfg()
             self.stop_hotkey_temporarily()
             import time
             time.sleep(0.1)
@@ -259,7 +260,7 @@ class TrayInputApp(QApplication):
             try:
                 icon = QIcon(icon_path)
                 if not icon.isNull():
-                    logger.debug(f"Using icon from {icon_path}")
+                    logger.debug("Using icon from %s", icon_path)
                     return icon
                 else:
                     logger.warning(f"Icon file exists but failed to load: {icon_path}")
@@ -292,22 +293,10 @@ class TrayInputApp(QApplication):
         
         if hasattr(self.input_dialog, '_cached_root_password'):
             self.input_dialog._cached_root_password = None
+        self.input_dialog._stop_sudo_helper()
+        self.input_dialog._flush_created_links()
         try:
-            settings_dict = {
-                "enable_hotkey": self.settings.value("enable_hotkey", True, bool),
-                "hotkey": self.settings.value("hotkey", "Ctrl+Q", str),
-                "hotkey_manager": self.settings.value("hotkey_manager", "auto", str),
-                "auto_paste": self.settings.value("auto_paste", True, bool),
-                "preserve_clipboard": self.settings.value("preserve_clipboard", True, bool),
-                "log_level": self.settings.value("log_level", "WARNING", str),
-                "auto_file_link": self.settings.value("auto_file_link", False, bool),
-                "target_directory": self.settings.value("target_directory", ROOT, str),
-                "use_symlink": self.settings.value("use_symlink", False, bool),
-                "auto_startup": self.settings.value("auto_startup", True, bool),
-                "active_dismissal_behavior": self.settings.value("active_dismissal_behavior", "content_and_cursor", str),
-                "passive_dismissal_behavior": self.settings.value("passive_dismissal_behavior", "follow_active", str)
-            }
-            save_settings_to_file(settings_dict)
+            save_settings_to_file(read_all_settings())
         except Exception as e:
             logger.error(f"Failed to save settings on exit: {e}")
         
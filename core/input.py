@@ -1,10 +1,22 @@
 import os
+import json
+import logging
 import threading
 import re
+import shlex
+import select
+import stat
 import subprocess
-from PyQt6.QtWidgets import QApplication, QTextEdit, QVBoxLayout, QWidget, QInputDialog, QLineEdit
+import time
+from urllib.parse import unquote_to_bytes
+from dataclasses import dataclass, field
+from typing import NamedTuple
+from PyQt6.QtWidgets import (QApplication, QPlainTextEdit, QVBoxLayout, QHBoxLayout, QWidget, QInputDialog,
+                             QLineEdit, QMessageBox, QDialog, QListWidget, QListWidgetItem, QPushButton,
+                             QLabel, QAbstractItemView)
 from PyQt6.QtGui import QKeyEvent, QIcon
-from PyQt6.QtCore import Qt, QEvent, QSettings, QMimeData, QUrl, QTimer
+from PyQt6.QtCore import (Qt, QEvent, QSettings, QMimeData, QUrl, QTimer, QObject, QRunnable,
+                          QThreadPool, pyqtSignal, pyqtSlot)
 from pynput import keyboard
 from pynput.keyboard import Key
 from .tools import *
@@ -12,28 +24,159 @@ from .tools import *
 from interface import CallbackPosition, CallbackContext
 from plugins import get_plugin_manager
 
+# Callback positions emitted on hot paths, bound once instead of looked up per event
+_POS_TEXT = CallbackPosition.ON_TEXT_CHANGED
+_POS_PASTE = CallbackPosition.ON_PASTE_IN_BOX
+_POS_HIDE = CallbackPosition.ON_INPUT_BOX_HIDE
 
-class CustomTextEdit(QTextEdit):
+_plugin_manager = None
+
+
+def _pm():
+    """Return the global plugin manager, caching it once it has been initialised."""
+    global _plugin_manager
+    if _plugin_manager is None:
+        _plugin_manager = get_plugin_manager()
+    return _plugin_manager
+
+_QUOTES = '"\''
+_FILE_URI_RE = re.compile(rb'^[ \t]*file://(?:localhost)?(/[^\r\n]*?)[ \t]*\r?$', re.M)  # Local file:// lines
+_DEBUG_FORMATS = frozenset({'x-special/gnome-copied-files', 'text/uri-list', 'text/plain'})  # Dumped on paste at DEBUG
+_LINKS_PATH = os.path.join(ROOT, "created_links.jsonl")
+
+
+class SavedState(NamedTuple):
+    """Input text and cursor/selection preserved across dismissals."""
+    text: str
+    cursor: int
+    sel_start: int
+    sel_end: int
+
+
+_EMPTY_STATE = SavedState("", 0, 0, 0)
+
+_DARK_QSS = """
+    QPlainTextEdit {
+        border: 2px solid #3498db;
+        border-radius: 8px;
+        padding: 8px;
+        font-size: 14px;
+        background-color: #2b2b2b;
+        color: white;
+    }
+"""
+_LIGHT_QSS = """
+    QPlainTextEdit {
+        border: 2px solid #3498db;
+        border-radius: 8px;
+        padding: 8px;
+        font-size: 14px;
+        background-color: white;
+        color: black;
+    }
+"""
+
+
+def _snapshot_mime(mime, skip_prefixes=('application/x-qt-image',)):
+    """Copy clipboard mime data for later restore, or None if there is nothing to copy.
+    
+    Formats Qt synthesises from others (its internal image format) are skipped.
+    """
+    if mime is None:
+        return None
+    formats = mime.formats()
+    if not formats:
+        return None
+    snapshot = QMimeData()
+    for format_name in formats:
+        if not format_name.startswith(skip_prefixes):
+            snapshot.setData(format_name, mime.data(format_name))
+    return snapshot
+
+
+def _save_nothing(text_edit) -> SavedState:
+    return _EMPTY_STATE
+
+
+def _save_content_only(text_edit) -> SavedState:
+    return SavedState(text_edit.toPlainText(), 0, 0, 0)
+
+
+def _save_content_and_cursor(text_edit) -> SavedState:
+    cursor = text_edit.textCursor()
+    position = cursor.position()
+    if cursor.hasSelection():
+        return SavedState(text_edit.toPlainText(), position, cursor.selectionStart(), cursor.selectionEnd())
+    return SavedState(text_edit.toPlainText(), position, position, position)
+
+
+_SAVE_FNS = {
+    "no_save": _save_nothing,
+    "content_only": _save_content_only,
+    "content_and_cursor": _save_content_and_cursor,
+}
+
+_SUDO_PROMPT = "[input-box] sudo password:"
+_SUDO_READY = "__INPUT_BOX_SUDO_READY__"
+_SUDO_DONE = "__INPUT_BOX_SUDO_DONE__"
+_SUDO_OK = "__OK__"  # Per-link success tag in batched sudo output
+
+
+@dataclass
+class LinkJob:
+    """A file-link request handed to a LinkWorker and back to the UI thread."""
+    sources: list[str]
+    target_dir: str
+    use_symlink: bool = False
+    fallback_text: str = ""
+    password: str | None = None
+    linked: list[tuple[str, str]] = field(default_factory=list)  # (source, link path)
+    pending: list[str] = field(default_factory=list)  # Sources that still need sudo
+
+
+class LinkWorkerSignals(QObject):
+    finished = pyqtSignal(object)  # LinkWorker
+
+
+class LinkWorker(QRunnable):
+    """Runs the blocking part of a link job on the thread pool."""
+    
+    def __init__(self, job: LinkJob, run):
+        super().__init__()
+        self.job = job
+        self._run = run
+        self.signals = LinkWorkerSignals()
+        self.setAutoDelete(False)  # Kept alive by InputDialog until the finished slot runs
+    
+    def run(self):
+        try:
+            self._run(self.job)
+        except Exception as e:
+            logger.error(f"Error in link worker for {self.job.sources}: {e}")
+        self.signals.finished.emit(self)
+
+
+class CustomTextEdit(QPlainTextEdit):
     def __init__(self, parent: "InputDialog"):
         super().__init__(None)
         self._input_dialog = parent
-        self.setAcceptRichText(False)
+        self._ctx = CallbackContext(app=None, logger=logger)
         
         self.textChanged.connect(self._on_text_changed)
     
+    @pyqtSlot()
     def _on_text_changed(self):
         """Handle text changed event."""
         if (self._input_dialog and 
             hasattr(self._input_dialog, 'app') and 
             self._input_dialog.app):
-            plugin_manager = get_plugin_manager()
-            if plugin_manager:
-                context = CallbackContext(
-                    app=self._input_dialog.app, 
-                    logger=logger,
-                    data={'text': self.toPlainText()}
-                )
-                plugin_manager.trigger_callbacks(CallbackPosition.ON_TEXT_CHANGED, context)
+            plugin_manager = _pm()
+            # Copying the document is the expensive part: skip it when nothing listens
+            if plugin_manager and plugin_manager.callbacks.get(_POS_TEXT):
+                # Reuse one context per widget; a fresh data dict keeps earlier ones intact for plugins
+                self._ctx.app = self._input_dialog.app
+                self._ctx.data = {'text': self.toPlainText()}
+                plugin_manager.trigger_callbacks(_POS_TEXT, self._ctx)
     
     def insertFromMimeData(self, source):
         """Override to handle file paste detection and force plain text."""
@@ -42,39 +185,39 @@ class CustomTextEdit(QTextEdit):
             logger.debug("No mime data source provided")
             return
         
-        logger.debug(f"Mime data formats: {source.formats()}")
-        for format_name in source.formats():
-            if format_name in ['x-special/gnome-copied-files', 'text/uri-list', 'text/plain']:
+        if logger.isEnabledFor(logging.DEBUG):
+            formats = source.formats()
+            logger.debug("Mime data formats: %s", formats)
+            for format_name in _DEBUG_FORMATS.intersection(formats):
                 try:
                     data = source.data(format_name)
                     if data:
                         content = data.data().decode('utf-8', errors='ignore')
-                        logger.debug(f"Content of {format_name}: {content}")
+                        logger.debug("Content of %s: %s", format_name, content)
                 except Exception as e:
-                    logger.debug(f"Could not decode {format_name}: {e}")
-        
-        if source.hasUrls():
-            urls = source.urls()
-            logger.debug(f"Number of URLs: {len(urls)}")
-            for i, url in enumerate(urls):
-                logger.debug(f"URL {i}: {url.toString()}, is local file: {url.isLocalFile()}")
-                if url.isLocalFile():
-                    logger.debug(f"Local file path: {url.toLocalFile()}")
-        
-        if source.hasText():
-            text = source.text()
-            logger.debug(f"Text content (first 100 chars): {text[:100]}")
+                    logger.debug("Could not decode %s: %s", format_name, e)
             
+            if source.hasUrls():
+                urls = source.urls()
+                logger.debug("Number of URLs: %s", len(urls))
+                for i, url in enumerate(urls):
+                    logger.debug("URL %s: %s, is local file: %s", i, url.toString(), url.isLocalFile())
+                    if url.isLocalFile():
+                        logger.debug("Local file path: %s", url.toLocalFile())
+            
+            if source.hasText():
+                logger.debug("Text content (first 100 chars): %.100s", source.text())
+        
         # Trigger paste callback
         if self._input_dialog and hasattr(self._input_dialog, 'app') and self._input_dialog.app:
-            plugin_manager = get_plugin_manager()
+            plugin_manager = _pm()
             if plugin_manager:
                 context = CallbackContext(
                     app=self._input_dialog.app, 
                     logger=logger,
                     data={'mime_data': source}
                 )
-                plugin_manager.trigger_callbacks(CallbackPosition.ON_PASTE_IN_BOX, context)
+                plugin_manager.trigger_callbacks(_POS_PASTE, context)
             
         if self._input_dialog and self._input_dialog.handle_file_paste(source):
             # File was processed, don't insert the original content
@@ -84,7 +227,7 @@ class CustomTextEdit(QTextEdit):
         # For non-file content, only insert plain text
         if source.hasText():
             plain_text = source.text()
-            logger.debug(f"Inserting plain text: {plain_text[:50]}...")
+            logger.debug("Inserting plain text: %.50s...", plain_text)
             self.insertPlainText(plain_text)
         # Not calling super() to avoid inserting rich content
 
@@ -105,14 +248,23 @@ class InputDialog(QWidget):
         self.text_edit.installEventFilter(self)
         config_path = os.path.join(ROOT, "input-box.config")
         self.settings = QSettings(config_path, QSettings.Format.IniFormat)
+        self._reload_cfg()
         
-        self._saved_text = ""
-        self._saved_cursor_position = 0
-        self._saved_selection_start = 0
-        self._saved_selection_end = 0
+        self._saved_state: SavedState = _EMPTY_STATE
         self._should_select_all = False
+        self._last_theme_dark: bool | None = None  # Theme of the applied stylesheet
         self._last_dismissal_was_active = True  # Track if last dismissal was active (Esc) or passive (focus loss)
         self._cached_root_password = None  # Cache root password in memory only
+        self._sudo_proc: subprocess.Popen | None = None  # Privileged shell reused across sudo operations
+        self._sudo_lock = threading.RLock()  # Serialises helper access from link workers
+        self._link_workers: set[LinkWorker] = set()
+        self._created_links_cache: list | None = None  # Validated created_links, loaded lazily
+        self._created_links_index: set[str] = set()  # link_path values present in the cache
+        self._created_links_dirty = False  # Cache has removals not yet rewritten to disk
+        self._links_flush_timer = QTimer(self)
+        self._links_flush_timer.setSingleShot(True)
+        self._links_flush_timer.setInterval(500)
+        self._links_flush_timer.timeout.connect(self._flush_created_links)
     
     def save_current_state(self, behavior="content_and_cursor"):
         """Save current text and cursor position based on behavior setting.
@@ -120,63 +272,58 @@ class InputDialog(QWidget):
         Args:
             behavior: "content_and_cursor", "content_only", or "no_save"
         """
-        if behavior == "no_save":
-            self._saved_text = ""
-            self._saved_cursor_position = 0
-            self._saved_selection_start = 0
-            self._saved_selection_end = 0
-            logger.debug("No state saved (no_save behavior)")
-        elif behavior == "content_only":
-            self._saved_text = self.text_edit.toPlainText()
-            self._saved_cursor_position = 0
-            self._saved_selection_start = 0
-            self._saved_selection_end = 0
-            logger.debug(f"Saved content only: {len(self._saved_text)} chars")
+        state = _SAVE_FNS.get(behavior, _save_content_and_cursor)(self.text_edit)
+        self._saved_state = state
+        logger.debug("Saved input state (%s): %s chars, cursor at %s, selection %s-%s",
+                     behavior, len(state.text), state.cursor, state.sel_start, state.sel_end)
+    
+    def _apply_saved_cursor(self, state):
+        """Move the text cursor to the saved cursor/selection; the saved text must be loaded."""
+        cursor = self.text_edit.textCursor()
+        max_pos = len(state.text)
+        selection_start = min(state.sel_start, max_pos)
+        selection_end = min(state.sel_end, max_pos)
+        if selection_start != selection_end:
+            cursor.setPosition(selection_start)
+            cursor.setPosition(selection_end, cursor.MoveMode.KeepAnchor)
         else:
-            self._saved_text = self.text_edit.toPlainText()
-            cursor = self.text_edit.textCursor()
-            self._saved_cursor_position = cursor.position()
-            if cursor.hasSelection():
-                self._saved_selection_start = cursor.selectionStart()
-                self._saved_selection_end = cursor.selectionEnd()
-                logger.debug(f"Saved content and cursor with selection: {len(self._saved_text)} chars, selection {self._saved_selection_start}-{self._saved_selection_end}")
-            else:
-                self._saved_selection_start = cursor.position()
-                self._saved_selection_end = cursor.position()
-                logger.debug(f"Saved content and cursor: {len(self._saved_text)} chars, cursor at {self._saved_cursor_position}")
+            cursor.setPosition(min(state.cursor, max_pos))
+        self.text_edit.setTextCursor(cursor)
+    
+    def _set_text_quiet(self, text):
+        """Replace the input text without emitting textChanged; skipped if already equal.
+        
+        Returns True if the text changed, so the caller can dispatch one text change itself.
+        """
+        if self.text_edit.toPlainText() == text:
+            return False
+        was_blocked = self.text_edit.blockSignals(True)
+        try:
+            self.text_edit.setPlainText(text)
+        finally:
+            self.text_edit.blockSignals(was_blocked)
+        return True
     
     def restore_saved_state(self, save_mode):
         """Restore previously saved text and cursor position based on save mode."""
-        if self._saved_text:
-            self.text_edit.setPlainText(self._saved_text)
-            if save_mode == "content_and_cursor":
-                cursor = self.text_edit.textCursor()
-                max_pos = len(self._saved_text)
-                selection_start = min(self._saved_selection_start, max_pos)
-                selection_end = min(self._saved_selection_end, max_pos)
-                
-                if selection_start != selection_end:
-                    cursor.setPosition(selection_start)
-                    cursor.setPosition(selection_end, cursor.MoveMode.KeepAnchor)
-                    self.text_edit.setTextCursor(cursor)
-                    logger.debug(f"Restored input state: {len(self._saved_text)} chars, selection {selection_start}-{selection_end}")
-                else:
-                    cursor_pos = min(self._saved_cursor_position, max_pos)
-                    cursor.setPosition(cursor_pos)
-                    self.text_edit.setTextCursor(cursor)
-                    logger.debug(f"Restored input state: {len(self._saved_text)} chars, cursor at {cursor_pos}")
-            elif save_mode == "content_only":
-                self._should_select_all = True
-                logger.debug(f"Restored input state: {len(self._saved_text)} chars, will select all")
-            else:
-                logger.critical("Restored input state: no valid save mode")
+        state = self._saved_state
+        if not state.text:
+            return
+        if self._set_text_quiet(state.text):
+            self.text_edit._on_text_changed()
+        if save_mode == "content_and_cursor":
+            self._apply_saved_cursor(state)
+            logger.debug("Restored input state: %s chars, cursor at %s, selection %s-%s",
+                         len(state.text), state.cursor, state.sel_start, state.sel_end)
+        elif save_mode == "content_only":
+            self._should_select_all = True
+            logger.debug("Restored input state: %s chars, will select all", len(state.text))
+        else:
+            logger.critical("Restored input state: no valid save mode")
 
     def clear_saved_state(self):
         """Clear saved state (called when user presses Enter)."""
-        self._saved_text = ""
-        self._saved_cursor_position = 0
-        self._saved_selection_start = 0
-        self._saved_selection_end = 0
+        self._saved_state = _EMPTY_STATE
         self._last_dismissal_was_active = True
         logger.debug("Cleared saved input state")
     
@@ -210,7 +357,7 @@ class InputDialog(QWidget):
         
         # Trigger input box hide callback
         if self.app:
-            plugin_manager = get_plugin_manager()
+            plugin_manager = _pm()
             if plugin_manager:
                 context = CallbackContext(
                     app=self.app, 
@@ -221,21 +368,16 @@ class InputDialog(QWidget):
                         'behavior': behavior
                     }
                 )
-                plugin_manager.trigger_callbacks(CallbackPosition.ON_INPUT_BOX_HIDE, context)
+                plugin_manager.trigger_callbacks(_POS_HIDE, context)
         
         self.hide()
         dismissal_type = "active" if is_active else "passive"
-        logger.debug(f"Hidden with {dismissal_type} dismissal ({behavior} behavior)")
+        logger.debug("Hidden with %s dismissal (%s behavior)", dismissal_type, behavior)
     
     def ensure_focus(self):
         if self.isVisible():
             if not self.isActiveWindow() or not self.text_edit.hasFocus():
-                saved_text = self.text_edit.toPlainText()
-                cursor = self.text_edit.textCursor()
-                saved_cursor_position = cursor.position()
-                saved_has_selection = cursor.hasSelection()
-                saved_selection_start = cursor.selectionStart() if saved_has_selection else cursor.position()
-                saved_selection_end = cursor.selectionEnd() if saved_has_selection else cursor.position()
+                current_state = _save_content_and_cursor(self.text_edit)
                 saved_position = self.pos()
                 
                 self.hide()
@@ -244,177 +386,296 @@ class InputDialog(QWidget):
                 self.raise_()
                 self.activateWindow()
                 
-                self.text_edit.setPlainText(saved_text)
-                
-                if self._saved_text and saved_text == self._saved_text:
+                restore_behavior = None
+                if self._saved_state.text and current_state.text == self._saved_state.text:
                     restore_behavior = self.get_dismissal_behavior(self._last_dismissal_was_active)
-                    if restore_behavior == "content_only":
-                        QTimer.singleShot(10, self.text_edit.selectAll)
-                    elif restore_behavior == "content_and_cursor":
-                        cursor = self.text_edit.textCursor()
-                        max_pos = len(saved_text)
-                        selection_start = min(self._saved_selection_start, max_pos)
-                        selection_end = min(self._saved_selection_end, max_pos)
-                        
-                        if selection_start != selection_end:
-                            cursor.setPosition(selection_start)
-                            cursor.setPosition(selection_end, cursor.MoveMode.KeepAnchor)
-                        else:
-                            cursor_pos = min(self._saved_cursor_position, max_pos)
-                            cursor.setPosition(cursor_pos)
-                        self.text_edit.setTextCursor(cursor)
-                else:
-                    cursor = self.text_edit.textCursor()
-                    max_pos = len(saved_text)
-                    
-                    if saved_has_selection:
-                        start_pos = min(saved_selection_start, max_pos)
-                        end_pos = min(saved_selection_end, max_pos)
-                        cursor.setPosition(start_pos)
-                        cursor.setPosition(end_pos, cursor.MoveMode.KeepAnchor)
-                    else:
-                        cursor_pos = min(saved_cursor_position, max_pos)
-                        cursor.setPosition(cursor_pos)
-                    self.text_edit.setTextCursor(cursor)
-                    
+                
+                # Restore text and cursor in one step, then dispatch at most one text change
+                text_changed = self._set_text_quiet(current_state.text)
+                if restore_behavior is None:
+                    self._apply_saved_cursor(current_state)
+                elif restore_behavior == "content_only":
+                    self.text_edit.selectAll()
+                elif restore_behavior == "content_and_cursor":
+                    self._apply_saved_cursor(self._saved_state)
+                if text_changed:
+                    self.text_edit._on_text_changed()
+                
                 self.text_edit.setFocus()
         else:
-            if self._saved_text:
+            if self._saved_state.text:
                 restore_behavior = self.get_dismissal_behavior(self._last_dismissal_was_active)
+                # content_only selection is applied by showEvent via _should_select_all
                 self.restore_saved_state(restore_behavior)
-            else:
-                self.text_edit.clear()
-                if self.text_edit.toPlainText():
-                    self.text_edit.selectAll()
+            elif self._set_text_quiet(""):
+                self.text_edit._on_text_changed()
             self.show()
             self.raise_()
             self.activateWindow()
             self.text_edit.setFocus()
-            
-            if self._saved_text:
-                restore_behavior = self.get_dismissal_behavior(self._last_dismissal_was_active)
-                if restore_behavior == "content_only":
-                    QTimer.singleShot(10, self.text_edit.selectAll)
     
     def clean_text(self, text: str) -> str:
-        lines = text.splitlines()
-        while lines and not lines[0].strip():
-            lines.pop(0)
-        while lines and not lines[-1].strip():
-            lines.pop()
-        return '\n'.join(lines)
+        # Slice off blank edge lines in place; toPlainText() always separates lines with '\n'
+        content_end = len(text.rstrip())
+        if not content_end:
+            return ''
+        content_start = len(text) - len(text.lstrip())
+        start = text.rfind('\n', 0, content_start) + 1
+        end = text.find('\n', content_end)
+        return text[start:end] if end != -1 else text[start:]
     
     def is_file_path(self, text: str) -> str | None:
         """Check if the text represents a file path."""
-        cleaned_text = text.strip().strip('"\'')
+        cleaned_text = text.strip().strip(_QUOTES)
+        if cleaned_text.startswith('file://'):
+            local_file = file_url_to_path(cleaned_text)
+            if local_file and os.path.isfile(local_file):
+                return local_file
+            return None
         expanded_text = expand_path(cleaned_text)
         if os.path.isfile(expanded_text):
             return expanded_text
-        if cleaned_text.startswith('file://'):
-            try:
-                url = QUrl(cleaned_text)
-                local_file = url.toLocalFile()
-                if os.path.isfile(local_file):
-                    return local_file
-            except:
-                pass
         return None
     
+    def _lstat_or_none(self, path):
+        """Return os.lstat(path), or None if nothing exists at path."""
+        try:
+            return os.lstat(path)
+        except FileNotFoundError:
+            return None
+    
+    def _is_link_to(self, source_file, target_path, target_lstat, use_symlink=False):
+        """Check whether an lstat-ed target_path is the requested link to source_file."""
+        is_symlink = stat.S_ISLNK(target_lstat.st_mode)
+        if use_symlink:
+            # For symlinks, only consider existing symlinks that point to the same file
+            if not is_symlink:
+                return False
+            return os.path.abspath(os.readlink(target_path)) == os.path.abspath(source_file)
+        # For hard links, only consider existing hard links (same inode)
+        if is_symlink:
+            return False
+        source_stat = os.stat(source_file)
+        return (source_stat.st_ino == target_lstat.st_ino and 
+               source_stat.st_dev == target_lstat.st_dev)
+    
     def check_link_creation_success(self, source_file, target_path, use_symlink=False):
         """Check if the link was actually created successfully."""
-        if not os.path.exists(target_path):
-            return False
-        
         try:
-            if use_symlink:
-                if os.path.islink(target_path):
-                    link_target = os.readlink(target_path)
-                    return os.path.abspath(link_target) == os.path.abspath(source_file)
+            target_lstat = self._lstat_or_none(target_path)
+            if target_lstat is None:
                 return False
-            else:
-                if os.path.islink(target_path):
-                    return False
-                source_stat = os.stat(source_file)
-                target_stat = os.stat(target_path)
-                return (source_stat.st_ino == target_stat.st_ino and 
-                       source_stat.st_dev == target_stat.st_dev)
+            return self._is_link_to(source_file, target_path, target_lstat, use_symlink)
         except Exception as e:
-            logger.debug(f"Error checking link creation success: {e}")
+            logger.debug("Error checking link creation success: %s", e)
             return False
     
     def create_file_link_with_sudo(self, source_file, target_dir, use_symlink=False, password=None):
         """Create file link using sudo when regular creation fails."""
-        try:
-            if not os.path.exists(target_dir):
-                result = subprocess.run(
-                    ['sudo', '-S', 'mkdir', '-p', target_dir],
-                    input=f"{password}\n" if password else "",
-                    text=True,
-                    capture_output=True,
-                    timeout=10
-                )
-                if result.returncode != 0:
-                    logger.error(f"Failed to create target directory with sudo: {result.stderr}")
-                    return None
-            
+        linked_path = self._create_link_privileged(source_file, target_dir, use_symlink, password)
+        if linked_path:
+            self.record_created_link(linked_path, source_file, use_symlink)
+        return linked_path
+    
+    def _create_link_privileged(self, source_file, target_dir, use_symlink=False, password=None):
+        """Create the link through the sudo helper without recording it; safe off the UI thread."""
+        linked = self._create_links_privileged_bulk([source_file], target_dir, use_symlink, password)
+        return linked[0][1] if linked else None
+    
+    def _create_links_privileged_bulk(self, sources, target_dir, use_symlink=False, password=None):
+        """Create links for several files with a single sudo script; safe off the UI thread.
+        
+        Returns:
+            A list of (source, link path) tuples for the links that exist afterwards.
+        """
+        linked = []
+        planned = []
+        reserved = set()
+        for source_file in sources:
             filename = os.path.basename(source_file)
             target_path = os.path.join(target_dir, filename)
-            
-            if os.path.exists(target_path):
-                if use_symlink:
-                    if os.path.islink(target_path):
-                        link_target = os.readlink(target_path)
-                        if os.path.abspath(link_target) == os.path.abspath(source_file):
-                            logger.info(f"Symbolic link already exists: {target_path}")
-                            self.record_created_link(target_path, source_file, True)
-                            return target_path
-                else:
-                    if not os.path.islink(target_path):
-                        source_stat = os.stat(source_file)
-                        target_stat = os.stat(target_path)
-                        if source_stat.st_ino == target_stat.st_ino and source_stat.st_dev == target_stat.st_dev:
-                            logger.info(f"Hard link already exists: {target_path}")
-                            self.record_created_link(target_path, source_file, False)
-                            return target_path
-                
-                counter = 1
-                base_name, ext = os.path.splitext(filename)
-                while os.path.exists(target_path):
-                    new_filename = f"{base_name}_{counter}{ext}"
-                    target_path = os.path.join(target_dir, new_filename)
-                    counter += 1
-            
-            if use_symlink:
-                cmd = ['sudo', '-S', 'ln', '-s', source_file, target_path]
-            else:
-                cmd = ['sudo', '-S', 'ln', source_file, target_path]
-            
-            result = subprocess.run(
-                cmd,
-                input=f"{password}\n" if password else "",
-                text=True,
-                capture_output=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                if self.check_link_creation_success(source_file, target_path, use_symlink):
-                    logger.info(f"Created {'symbolic' if use_symlink else 'hard'} link with sudo: {source_file} -> {target_path}")
-                    self.record_created_link(target_path, source_file, use_symlink)
-                    return target_path
-                else:
-                    logger.error(f"Link creation appeared successful but verification failed: {target_path}")
-                    return None
-            else:
-                logger.error(f"Failed to create link with sudo: {result.stderr}")
-                return None
-                
+            target_lstat = None
+            try:
+                target_lstat = self._lstat_or_none(target_path)
+                if target_lstat is not None and self._is_link_to(source_file, target_path, target_lstat, use_symlink):
+                    logger.info("%s link already exists: %s", 'Symbolic' if use_symlink else 'Hard', target_path)
+                    linked.append((source_file, target_path))
+                    continue
+            except OSError as e:
+                # Typically the target directory is not searchable by us; root can still create the link
+                logger.debug("Cannot inspect %s before sudo linking: %s", target_path, e)
+            if target_lstat is not None or filename in reserved:
+                target_path = self._next_available_path(target_dir, filename, reserved)
+            reserved.add(os.path.basename(target_path))
+            planned.append((source_file, target_path))
+        
+        if not planned:
+            return linked
+        
+        ln = 'ln -s' if use_symlink else 'ln'
+        script = "; ".join(
+            f"{ln} {shlex.quote(source_file)} {shlex.quote(target_path)} && echo {_SUDO_OK} {tag}"
+            for tag, (source_file, target_path) in enumerate(planned)
+        )
+        if not os.path.exists(target_dir):
+            script = f"mkdir -p {shlex.quote(target_dir)} && {{ {script}; }}"
+        
+        try:
+            result = self._run_sudo_script(script, password)
         except subprocess.TimeoutExpired:
             logger.error("Sudo command timed out")
-            return None
+            return linked
         except Exception as e:
             logger.error(f"Failed to create file link with sudo: {e}")
-            return None
+            return linked
+        
+        succeeded = set()
+        for line in result.stdout.splitlines():
+            tag, _, index = line.partition(' ')
+            if tag == _SUDO_OK and index.strip().isdigit():
+                succeeded.add(int(index))
+        
+        for tag, (source_file, target_path) in enumerate(planned):
+            if tag not in succeeded:
+                logger.error("Failed to create link with sudo for %s: %s", source_file, result.stderr)
+            elif self.check_link_creation_success(source_file, target_path, use_symlink):
+                logger.info("Created %s link with sudo: %s -> %s", 'symbolic' if use_symlink else 'hard', source_file, target_path)
+                linked.append((source_file, target_path))
+            else:
+                logger.error("Link creation appeared successful but verification failed: %s", target_path)
+        return linked
+    
+    def _start_sudo_helper(self, password, timeout=10):
+        """Start a root shell that stays alive for subsequent sudo operations."""
+        # -k forces a prompt so the password is never fed to the shell as a command
+        proc = subprocess.Popen(
+            ['sudo', '-S', '-k', '-p', _SUDO_PROMPT, 'sh', '-c', f'echo {_SUDO_READY}; exec sh'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0
+        )
+        stdout_buf = b""
+        stderr_buf = b""
+        prompts_answered = 0
+        deadline = time.monotonic() + timeout
+        try:
+            while _SUDO_READY.encode() not in stdout_buf:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(proc.args, timeout)
+                readable, _, _ = select.select([proc.stdout, proc.stderr], [], [], remaining)
+                for stream in readable:
+                    chunk = os.read(stream.fileno(), 4096)
+                    if not chunk:
+                        logger.error(f"Sudo helper exited during authentication: {stderr_buf.decode(errors='ignore').strip()}")
+                        self._kill_sudo_proc(proc)
+                        return None
+                    if stream is proc.stdout:
+                        stdout_buf += chunk
+                        continue
+                    stderr_buf += chunk
+                    if stderr_buf.count(_SUDO_PROMPT.encode()) > prompts_answered:
+                        if prompts_answered:
+                            logger.error("Sudo authentication failed")
+                            self._cached_root_password = None
+                            self._kill_sudo_proc(proc)
+                            return None
+                        proc.stdin.write(f"{password}\n".encode() if password else b"\n")
+                        prompts_answered += 1
+        except subprocess.TimeoutExpired:
+            self._kill_sudo_proc(proc)
+            raise
+        
+        logger.debug("Started persistent sudo helper")
+        return proc
+    
+    def _run_sudo_script(self, script, password=None, timeout=10):
+        """Run a shell script through the persistent sudo helper; stdout and stderr are merged."""
+        with self._sudo_lock:
+            return self._run_sudo_script_locked(script, password, timeout)
+    
+    def _run_sudo_script_locked(self, script, password=None, timeout=10):
+        args = script
+        proc = self._sudo_proc
+        if proc is None or proc.poll() is not None:
+            proc = self._start_sudo_helper(password, timeout)
+            if proc is None:
+                return subprocess.CompletedProcess(args, 1, "", "sudo authentication failed")
+            self._sudo_proc = proc
+        
+        marker = _SUDO_DONE.encode()
+        output = b""
+        deadline = time.monotonic() + timeout
+        try:
+            proc.stdin.write(f"{{ {script}\n}} 2>&1; echo {_SUDO_DONE} $?\n".encode())
+            while marker not in output or not output.endswith(b"\n"):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                readable, _, _ = select.select([proc.stdout], [], [], remaining)
+                if not readable:
+                    continue
+                chunk = os.read(proc.stdout.fileno(), 4096)
+                if not chunk:
+                    self._stop_sudo_helper()
+                    return subprocess.CompletedProcess(args, 1, "", "sudo helper exited unexpectedly")
+                output += chunk
+        except (subprocess.TimeoutExpired, BrokenPipeError):
+            self._stop_sudo_helper()
+            raise
+        
+        text, _, status = output.decode('utf-8', errors='ignore').rpartition(_SUDO_DONE)
+        try:
+            returncode = int(status.strip())
+        except ValueError:
+            returncode = 1
+        return subprocess.CompletedProcess(args, returncode, text, text)
+    
+    def _kill_sudo_proc(self, proc):
+        try:
+            proc.kill()
+            proc.wait(timeout=1)
+        except Exception:
+            pass
+    
+    def _stop_sudo_helper(self):
+        """Terminate the persistent sudo helper if it is running."""
+        with self._sudo_lock:
+            self._stop_sudo_helper_locked()
+    
+    def _stop_sudo_helper_locked(self):
+        proc = self._sudo_proc
+        self._sudo_proc = None
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None and proc.stdin:
+                proc.stdin.write(b"exit\n")
+                proc.wait(timeout=1)
+        except Exception:
+            self._kill_sudo_proc(proc)
+        logger.debug("Stopped persistent sudo helper")
+    
+    def _next_available_path(self, target_dir, filename, reserved=frozenset()):
+        """Return a free path for filename in target_dir, appending _N when the name is taken.
+        
+        Names in reserved are treated as taken, for links planned but not yet created.
+        """
+        try:
+            with os.scandir(target_dir) as entries:
+                taken = frozenset(entry.name for entry in entries)
+            is_taken = taken.__contains__
+        except OSError:
+            is_taken = lambda name: os.path.lexists(os.path.join(target_dir, name))
+        
+        base_name, ext = os.path.splitext(filename)
+        candidate = filename
+        counter = 1
+        while is_taken(candidate) or candidate in reserved:
+            candidate = f"{base_name}_{counter}{ext}"
+            counter += 1
+        return os.path.join(target_dir, candidate)
     
     def get_root_password(self):
         """Prompt user for root password and cache it in memory."""
@@ -435,131 +696,206 @@ class InputDialog(QWidget):
     
     def create_file_link(self, source_file, target_dir, use_symlink=False):
         """Create a hard link or symbolic link for the file in the target directory."""
+        linked_path = self._create_link_unprivileged(source_file, target_dir, use_symlink)
+        if linked_path:
+            self.record_created_link(linked_path, source_file, use_symlink)
+            return linked_path
+        
+        # Try with sudo in case the failure is permission-related
+        password = self.get_root_password()
+        if not password:
+            logger.warning("User cancelled root password prompt for %s", source_file)
+            return None
+        logger.info("Attempting to create link with elevated privileges")
+        sudo_result = self.create_file_link_with_sudo(source_file, target_dir, use_symlink, password)
+        if not sudo_result:
+            logger.critical("Failed to create link even with elevated privileges: %s -> %s", source_file, target_dir)
+        return sudo_result
+    
+    def _create_link_unprivileged(self, source_file, target_dir, use_symlink=False):
+        """Create the link without elevated privileges or recording; safe off the UI thread.
+        
+        Returns:
+            The link path, or None if creation failed and sudo should be tried.
+        """
         try:
             if not os.path.exists(target_dir):
                 os.makedirs(target_dir, exist_ok=True)
             filename = os.path.basename(source_file)
             target_path = os.path.join(target_dir, filename)
             # Check if file already exists
-            if os.path.exists(target_path):
-                if use_symlink:
-                    # For symlinks, only consider existing symlinks that point to the same file
-                    if os.path.islink(target_path):
-                        link_target = os.readlink(target_path)
-                        if os.path.abspath(link_target) == os.path.abspath(source_file):
-                            logger.info(f"Symbolic link already exists: {target_path}")
-                            self.record_created_link(target_path, source_file, True)
-                            return target_path
-                else:
-                    # For hard links, only consider existing hard links (same inode)
-                    if not os.path.islink(target_path):
-                        source_stat = os.stat(source_file)
-                        target_stat = os.stat(target_path)
-                        if source_stat.st_ino == target_stat.st_ino and source_stat.st_dev == target_stat.st_dev:
-                            logger.info(f"Hard link already exists: {target_path}")
-                            self.record_created_link(target_path, source_file, False)
-                            return target_path
-                counter = 1
-                base_name, ext = os.path.splitext(filename)
-                while os.path.exists(target_path):
-                    new_filename = f"{base_name}_{counter}{ext}"
-                    target_path = os.path.join(target_dir, new_filename)
-                    counter += 1
+            target_lstat = self._lstat_or_none(target_path)
+            if target_lstat is not None:
+                if self._is_link_to(source_file, target_path, target_lstat, use_symlink):
+                    logger.info("%s link already exists: %s", 'Symbolic' if use_symlink else 'Hard', target_path)
+                    return target_path
+                target_path = self._next_available_path(target_dir, filename)
             
             if use_symlink:
                 os.symlink(source_file, target_path)
-                logger.info(f"Created symbolic link: {source_file} -> {target_path}")
+                logger.info("Created symbolic link: %s -> %s", source_file, target_path)
             else:
                 os.link(source_file, target_path)
-                logger.info(f"Created hard link: {source_file} -> {target_path}")
+                logger.info("Created hard link: %s -> %s", source_file, target_path)
             
             # Verify the link was created successfully
             if self.check_link_creation_success(source_file, target_path, use_symlink):
-                self.record_created_link(target_path, source_file, use_symlink)
                 return target_path
-            else:
-                logger.warning(f"Link creation failed verification for {source_file} -> {target_path}")
-                # Try with sudo if verification failed
-                password = self.get_root_password()
-                if password:
-                    logger.info(f"Attempting to create link with elevated privileges")
-                    sudo_result = self.create_file_link_with_sudo(source_file, target_dir, use_symlink, password)
-                    if sudo_result:
-                        return sudo_result
-                    else:
-                        logger.critical(f"Failed to create link even with elevated privileges: {source_file} -> {target_dir}")
-                        return None
-                else:
-                    logger.warning(f"User cancelled root password prompt for {source_file}")
-                    return None
-            
+            logger.warning("Link creation failed verification for %s -> %s", source_file, target_path)
         except PermissionError as e:
-            logger.warning(f"Permission denied creating link for {source_file}: {e}")
-            # Try with sudo for permission errors
-            password = self.get_root_password()
-            if password:
-                logger.info(f"Attempting to create link with elevated privileges due to permission error")
-                sudo_result = self.create_file_link_with_sudo(source_file, target_dir, use_symlink, password)
-                if sudo_result:
-                    return sudo_result
-                else:
-                    logger.critical(f"Failed to create link even with elevated privileges after permission error: {source_file} -> {target_dir}")
-                    return None
-            else:
-                logger.warning(f"User cancelled root password prompt after permission error for {source_file}")
-                return None
+            logger.warning("Permission denied creating link for %s: %s", source_file, e)
         except Exception as e:
-            logger.warning(f"Failed to create file link for {source_file}: {e}")
-            # For other exceptions, also try with sudo in case it's a permission-related issue
+            logger.warning("Failed to create file link for %s: %s", source_file, e)
+        return None
+    
+    def create_file_links_bulk(self, sources, target_dir, use_symlink=False):
+        """Create links for several files without elevated privileges; safe off the UI thread.
+        
+        Returns:
+            A tuple of (linked, pending): (source, link path) tuples for the links created
+            and the sources that failed and should be retried in one sudo batch.
+        """
+        linked = []
+        pending = []
+        for source_file in sources:
+            linked_path = self._create_link_unprivileged(source_file, target_dir, use_symlink)
+            if linked_path:
+                linked.append((source_file, linked_path))
+            else:
+                pending.append(source_file)
+        return linked, pending
+    
+    def _start_link_job(self, job):
+        """Run a link job on the global thread pool; completion is delivered on the UI thread."""
+        worker = LinkWorker(job, self._run_link_job)
+        worker.signals.finished.connect(self._on_link_job_finished)
+        self._link_workers.add(worker)
+        QThreadPool.globalInstance().start(worker)
+    
+    def _run_link_job(self, job):
+        """Worker-thread half of a link job."""
+        if job.password is None:
+            job.linked, job.pending = self.create_file_links_bulk(job.sources, job.target_dir, job.use_symlink)
+        else:
+            job.linked += self._create_links_privileged_bulk(job.pending, job.target_dir, job.use_symlink, job.password)
+            done = {source for source, _ in job.linked}
+            job.pending = [source for source in job.pending if source not in done]
+    
+    @pyqtSlot(object)
+    def _on_link_job_finished(self, worker):
+        """UI-thread half of a link job: ask for a password, then record the links or fall back."""
+        self._link_workers.discard(worker)
+        job = worker.job
+        if job.pending and job.password is None:
             password = self.get_root_password()
             if password:
-                logger.info(f"Attempting to create link with elevated privileges due to error: {e}")
-                sudo_result = self.create_file_link_with_sudo(source_file, target_dir, use_symlink, password)
-                if sudo_result:
-                    return sudo_result
-                else:
-                    logger.critical(f"Failed to create link even with elevated privileges after error: {source_file} -> {target_dir}, original error: {e}")
-                    return None
-            else:
-                logger.warning(f"User cancelled root password prompt after error for {source_file}: {e}")
-                return None
+                logger.info("Attempting to create %d link(s) with elevated privileges", len(job.pending))
+                job.password = password
+                self._start_link_job(job)
+                return
+            logger.warning("User cancelled root password prompt for %s", job.pending)
+        elif job.pending:
+            logger.critical("Failed to create link even with elevated privileges: %s -> %s", job.pending, job.target_dir)
+        
+        for source_file, linked_path in job.linked:
+            self.record_created_link(linked_path, source_file, job.use_symlink)
+        if job.linked:
+            self._finish_file_paste(job.linked)
+            return
+        
+        logger.debug("File paste handled but link creation failed for: %s", job.sources)
+        if job.fallback_text and self.isVisible():
+            self.text_edit.insertPlainText(job.fallback_text)
     
     def record_created_link(self, link_path, source_path, is_symlink):
-        """Record a created link in the config file."""
+        """Record a created link in the created links file."""
         try:
             existing_links = self.get_created_links()
             if not link_path or not isinstance(link_path, str):
-                logger.error(f"Invalid link_path: {link_path}")
+                logger.error("Invalid link_path: %s", link_path)
                 return
             if not source_path or not isinstance(source_path, str):
-                logger.error(f"Invalid source_path: {source_path}")
+                logger.error("Invalid source_path: %s", source_path)
                 return
+            if link_path in self._created_links_index:
+                logger.debug("Link already recorded: %s", link_path)
+                return
+            link_stat = self._lstat_or_none(link_path)
             link_info = {
                 'link_path': link_path,
                 'source_path': source_path,
                 'is_symlink': bool(is_symlink),
-                'created_time': os.path.getctime(link_path) if os.path.exists(link_path) else 0
+                'created_time': link_stat.st_ctime if link_stat is not None else 0
             }
-            for existing in existing_links:
-                if isinstance(existing, dict) and existing.get('link_path') == link_path:
-                    logger.debug(f"Link already recorded: {link_path}")
-                    return
-            
             existing_links.append(link_info)
-            self.settings.setValue("created_links", existing_links)
-            logger.debug(f"Recorded created link: {link_path} ({'symlink' if is_symlink else 'hardlink'})")
+            self._created_links_index.add(link_path)
+            self._append_created_link(link_info)
+            logger.debug("Recorded created link: %s (%s)", link_path, 'symlink' if is_symlink else 'hardlink')
             
         except Exception as e:
-            logger.error(f"Failed to record created link {link_path}: {e}")
+            logger.error("Failed to record created link %s: %s", link_path, e)
     
-    def get_created_links(self):
-        """Get list of created links from config."""
-        try:
+    def _append_created_link(self, link_info):
+        """Append a single link entry to the created links file."""
+        with open(_LINKS_PATH, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(link_info) + "\n")
+    
+    def _schedule_created_links_flush(self):
+        """Rewrite the links file from the cache once deletions have been quiet for a moment."""
+        self._created_links_dirty = True
+        self._links_flush_timer.start()  # Restarting debounces rapid delete batches
+    
+    @pyqtSlot()
+    def _flush_created_links(self):
+        """Write pending cache removals to disk, if any."""
+        self._links_flush_timer.stop()
+        if self._created_links_dirty:
+            self._created_links_dirty = False
+            self._save_created_links(self._created_links_cache or [])
+    
+    def _save_created_links(self, links):
+        """Atomically rewrite the created links file with the given entries."""
+        tmp_path = f"{_LINKS_PATH}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for link in links:
+                f.write(json.dumps(link) + "\n")
+        os.replace(tmp_path, _LINKS_PATH)
+    
+    def _read_created_links_file(self):
+        """Read raw link entries, migrating the legacy QSettings list on first use."""
+        if not os.path.exists(_LINKS_PATH):
             links = self.settings.value("created_links", [], list)
             if not isinstance(links, list):
-                logger.warning("Invalid created_links format in config, resetting to empty list")
-                self.settings.setValue("created_links", [])
-                return []
+                links = []
+            self._save_created_links([link for link in links if isinstance(link, dict)])
+            self.settings.remove("created_links")
+            return links
+        
+        links = []
+        with open(_LINKS_PATH, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    links.append(json.loads(line))
+                except json.JSONDecodeError:
+                    links.append(line)  # Kept so validation drops it and rewrites the file
+        return links
+    
+    def get_created_links(self, refresh=False):
+        """Get list of created links, validating against the config only on first load or refresh."""
+        if self._created_links_cache is not None and not refresh:
+            return self._created_links_cache
+        self._flush_created_links()
+        self._created_links_cache = self._load_created_links()
+        self._created_links_index = {link['link_path'] for link in self._created_links_cache}
+        return self._created_links_cache
+    
+    def _load_created_links(self):
+        """Load created links from disk, dropping malformed or missing entries."""
+        try:
+            links = self._read_created_links_file()
             existing_links = []
             for link in links:
                 try:
@@ -576,31 +912,27 @@ class InputDialog(QWidget):
                         logger.warning(f"Invalid link_path: {link_path}")
                         continue
                     
-                    if os.path.exists(link_path):
+                    # lexists keeps dangling symlinks listed so they can still be cleaned up
+                    if os.path.lexists(link_path):
                         existing_links.append(link)
                     else:
-                        logger.debug(f"Link no longer exists: {link_path}")
+                        logger.debug("Link no longer exists: %s", link_path)
                 except Exception as e:
                     logger.warning(f"Error processing link entry {link}: {e}")
                     continue
             if len(existing_links) != len(links):
-                self.settings.setValue("created_links", existing_links)
+                self._save_created_links(existing_links)
                 logger.info(f"Cleaned up {len(links) - len(existing_links)} invalid/missing link entries")
             
             return existing_links
         except Exception as e:
             logger.error(f"Failed to get created links: {e}")
-            self.settings.setValue("created_links", [])
             return []
     
     def cleanup_created_links(self):
         """Clean up created links with smart deletion logic."""
-        from PyQt6.QtWidgets import (QDialog, QListWidget, QListWidgetItem, QVBoxLayout, 
-                                     QHBoxLayout, QPushButton, QCheckBox, QLabel, QScrollArea, QWidget)
-        
-        links = self.get_created_links()
+        links = self.get_created_links(refresh=True)
         if not links:
-            from PyQt6.QtWidgets import QMessageBox
             QMessageBox.information(self, "No Links", "No created links found to clean up.")
             return
         dialog = QDialog(self)
@@ -613,11 +945,10 @@ class InputDialog(QWidget):
         description_label = QLabel("Select links to delete:")
         description_label.setWordWrap(True)
         layout.addWidget(description_label)
-        scroll_area = QScrollArea()
-        scroll_widget = QWidget()
-        scroll_layout = QVBoxLayout()
-        scroll_layout.setContentsMargins(5, 5, 5, 5)
-        checkboxes = []
+        # Checkable list items instead of one QCheckBox widget per link
+        list_widget = QListWidget()
+        list_widget.setUniformItemSizes(True)
+        list_widget.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         for link in links:
             link_path = link.get('link_path', '')
             source_path = link.get('source_path', '')
@@ -629,15 +960,12 @@ class InputDialog(QWidget):
             link_type = "symlink" if is_symlink else "hardlink"
             display_text = f"{shorten_path(link_path)} ({link_type}) -> {shorten_path(source_path)}"
             
-            checkbox = QCheckBox(display_text)
-            setattr(checkbox, 'link_info', link)
-            checkboxes.append(checkbox)
-            scroll_layout.addWidget(checkbox)
-        
-        scroll_widget.setLayout(scroll_layout)
-        scroll_area.setWidget(scroll_widget)
-        scroll_area.setWidgetResizable(True)
-        layout.addWidget(scroll_area)
+            item = QListWidgetItem(display_text)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            item.setData(Qt.ItemDataRole.UserRole, link)
+            list_widget.addItem(item)
+        layout.addWidget(list_widget)
         
         # Add buttons
         button_layout = QHBoxLayout()
@@ -646,16 +974,24 @@ class InputDialog(QWidget):
         ok_btn = QPushButton("Delete Selected")
         cancel_btn = QPushButton("Cancel")
         
+        def set_all_checked(state):
+            list_widget.setUpdatesEnabled(False)
+            try:
+                for row in range(list_widget.count()):
+                    list_widget.item(row).setCheckState(state)
+            finally:
+                list_widget.setUpdatesEnabled(True)
+        
         def select_all():
-            for cb in checkboxes:
-                cb.setChecked(True)
+            set_all_checked(Qt.CheckState.Checked)
         
         def select_none():
-            for cb in checkboxes:
-                cb.setChecked(False)
+            set_all_checked(Qt.CheckState.Unchecked)
         
         def on_ok():
-            links_to_delete = [getattr(cb, 'link_info') for cb in checkboxes if cb.isChecked()]
+            links_to_delete = [list_widget.item(row).data(Qt.ItemDataRole.UserRole)
+                               for row in range(list_widget.count())
+                               if list_widget.item(row).checkState() == Qt.CheckState.Checked]
             dialog.accept()
             self.delete_selected_links(links_to_delete)
         
@@ -676,259 +1012,244 @@ class InputDialog(QWidget):
     
     def delete_selected_links(self, links_to_delete):
         """Delete selected links with confirmation for files that would be physically deleted."""
-        from PyQt6.QtWidgets import QMessageBox
-        
         if not links_to_delete:
             return
         
+        # One lstat per link: it both detects symlinks and gives the hard link count
+        deletable = []
+        last_references = []
+        deleted_paths = set()
         for link_info in links_to_delete:
             link_path = link_info['link_path']
-            is_symlink = link_info.get('is_symlink', False)
-            
-            if not os.path.exists(link_path):
+            try:
+                link_stat = self._lstat_or_none(link_path)
+            except OSError as e:
+                logger.error(f"Error checking link count for {link_path}: {e}")
+                continue
+            if link_stat is None:
                 logger.warning(f"Link no longer exists: {link_path}")
+                deleted_paths.add(link_path)
                 continue
-            
-            should_delete = True
-            
-            if not is_symlink and os.path.exists(link_path):
-                try:
-                    link_stat = os.stat(link_path)
-                    if link_stat.st_nlink <= 1:
-                        reply = QMessageBox.question(
-                            self, 
-                            "Confirm File Deletion",
-                            f"Deleting this hard link will permanently remove the file:\n{shorten_path(link_path)}\n\nThis is the last reference to the file. Are you sure?",
-                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.YesToAll | QMessageBox.StandardButton.NoToAll
-                        )
-                        
-                        if reply == QMessageBox.StandardButton.No:
-                            should_delete = False
-                        elif reply == QMessageBox.StandardButton.NoToAll:
-                            break
-                        elif reply == QMessageBox.StandardButton.YesToAll:
-                            pass
-                            
-                except Exception as e:
-                    logger.error(f"Error checking link count for {link_path}: {e}")
-            
-            if should_delete:
-                try:
-                    os.remove(link_path)
-                    logger.info(f"Deleted link: {link_path}")
-                except Exception as e:
-                    logger.error(f"Failed to delete link {link_path}: {e}")
-                    QMessageBox.warning(self, "Deletion Failed", f"Failed to delete {shorten_path(link_path)}: {e}")
-        remaining_links = []
-        all_links = self.get_created_links()
-        deleted_paths = {link['link_path'] for link in links_to_delete}
-        
-        for link in all_links:
-            if link['link_path'] not in deleted_paths:
-                remaining_links.append(link)
-        
-        self.settings.setValue("created_links", remaining_links)
-        logger.info(f"Cleaned up {len(links_to_delete)} links")
-
-    def detect_file_from_clipboard(self, mime_data):
-        """Detect if the clipboard contains file data and return file path."""
-        logger.debug("detect_file_from_clipboard called")
-        if not mime_data:
-            logger.debug("No mime data provided to detect_file_from_clipboard")
-            return None
+            if not stat.S_ISLNK(link_stat.st_mode) and link_stat.st_nlink <= 1:
+                last_references.append(link_path)
+            else:
+                deletable.append(link_path)
         
-        logger.debug(f"Mime data formats in detect_file_from_clipboard: {mime_data.formats()}")
+        if last_references:
+            confirm = QMessageBox(self)
+            confirm.setIcon(QMessageBox.Icon.Question)
+            confirm.setWindowTitle("Confirm File Deletion")
+            confirm.setText(
+                f"Deleting {len(last_references)} hard link(s) will permanently remove the files, "
+                "as they are the last reference to them. Are you sure?"
+            )
+            confirm.setDetailedText("\n".join(shorten_path(path) for path in last_references))
+            confirm.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            confirm.setDefaultButton(QMessageBox.StandardButton.No)
+            if confirm.exec() == QMessageBox.StandardButton.Yes:
+                deletable.extend(last_references)
+            else:
+                logger.info(f"Kept {len(last_references)} last-reference hard links")
         
-        # Handle GNOME file manager copied files format
-        if 'x-special/gnome-copied-files' in mime_data.formats():
+        failures = []
+        for link_path in deletable:
             try:
-                data = mime_data.data('x-special/gnome-copied-files')
-                if data:
-                    content = data.data().decode('utf-8', errors='ignore').strip()
-                    logger.debug(f"GNOME copied files content: {content}")
-                    
-                    # Parse the content - format is usually "copy\nfile:///path/to/file"
-                    lines = content.split('\n')
-                    for line in lines:
-                        if line.startswith('file://'):
-                            try:
-                                url = QUrl(line)
-                                if url.isLocalFile():
-                                    file_path = url.toLocalFile()
-                                    logger.debug(f"Found file from GNOME format: {file_path}")
-                                    if os.path.isfile(file_path):
-                                        logger.debug(f"Confirmed file exists: {file_path}")
-                                        return file_path
-                                    else:
-                                        logger.debug(f"File does not exist: {file_path}")
-                            except Exception as e:
-                                logger.debug(f"Error parsing GNOME file URL {line}: {e}")
+                os.remove(link_path)
+                deleted_paths.add(link_path)
+                logger.info(f"Deleted link: {link_path}")
             except Exception as e:
-                logger.debug(f"Error processing x-special/gnome-copied-files: {e}")
+                logger.error(f"Failed to delete link {link_path}: {e}")
+                failures.append(f"{shorten_path(link_path)}: {e}")
+        if failures:
+            QMessageBox.warning(self, "Deletion Failed", "Failed to delete:\n" + "\n".join(failures))
         
-        # Handle standard text/uri-list format
-        if 'text/uri-list' in mime_data.formats():
-            try:
-                data = mime_data.data('text/uri-list')
-                if data:
-                    content = data.data().decode('utf-8', errors='ignore').strip()
-                    logger.debug(f"URI list content: {content}")
-                    
-                    lines = content.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            try:
-                                url = QUrl(line)
-                                if url.isLocalFile():
-                                    file_path = url.toLocalFile()
-                                    logger.debug(f"Found file from URI list: {file_path}")
-                                    if os.path.isfile(file_path):
-                                        logger.debug(f"Confirmed file exists: {file_path}")
-                                        return file_path
-                                    else:
-                                        logger.debug(f"File does not exist: {file_path}")
-                            except Exception as e:
-                                logger.debug(f"Error parsing URI {line}: {e}")
-            except Exception as e:
-                logger.debug(f"Error processing text/uri-list: {e}")
+        all_links = self.get_created_links()
+        removed_paths = deleted_paths & self._created_links_index
+        if removed_paths:
+            # One in-place pass over the cache; the file rewrite is debounced
+            all_links[:] = [link for link in all_links if link['link_path'] not in removed_paths]
+            self._created_links_index -= removed_paths
+            self._schedule_created_links_flush()
+        logger.info(f"Cleaned up {len(deleted_paths)} links")
+
+    def detect_file_from_clipboard(self, mime_data):
+        """Detect if the clipboard contains file data and return the first file path."""
+        file_paths = self.detect_files_from_clipboard(mime_data)
+        return file_paths[0] if file_paths else None
+    
+    def detect_files_from_clipboard(self, mime_data):
+        """Detect if the clipboard contains file data and return all file paths."""
+        dbg = logger.isEnabledFor(logging.DEBUG)  # Checked once for the per-format/per-file messages
+        logger.debug("detect_files_from_clipboard called")
+        if not mime_data:
+            logger.debug("No mime data provided to detect_files_from_clipboard")
+            return []
         
-        # Standard Qt URL handling
+        # Standard Qt URL handling covers most file managers, so try it first
         if mime_data.hasUrls():
             urls = mime_data.urls()
-            logger.debug(f"Found {len(urls)} URLs in mime data")
-            if urls:
-                for i, url in enumerate(urls):
-                    logger.debug(f"Processing URL {i}: {url.toString()}")
-                    if url.isLocalFile():
-                        file_path = url.toLocalFile()
-                        logger.debug(f"URL is local file: {file_path}")
-                        if os.path.isfile(file_path):
-                            logger.debug(f"Confirmed file exists: {file_path}")
-                            return file_path
-                        else:
-                            logger.debug(f"File does not exist: {file_path}")
-                    else:
-                        logger.debug(f"URL is not a local file: {url.toString()}")
+            logger.debug("Found %s URLs in mime data", len(urls))
+            file_paths = [path for url in urls
+                          if url.isLocalFile() and os.path.isfile(path := url.toLocalFile())]
+            if file_paths:
+                logger.debug("Confirmed local files from URLs: %s", file_paths)
+                return file_paths
         else:
             logger.debug("No URLs found in mime data")
-            
-        # Handle plain text that might be a file path
+        
+        # Handle GNOME file manager copied files format ("copy\nfile:///path/to/file")
+        # and the standard text/uri-list format, both parsed straight from the raw bytes
+        formats = set(mime_data.formats())
+        if dbg:
+            logger.debug("Mime data formats in detect_files_from_clipboard: %s", formats)
+        for format_name in ('x-special/gnome-copied-files', 'text/uri-list'):
+            if format_name in formats:
+                try:
+                    raw = mime_data.data(format_name).data()
+                    if dbg:
+                        logger.debug("%s content: %.200r", format_name, raw)
+                    file_paths = self._file_paths_from_uri_bytes(raw, dbg)
+                except Exception as e:
+                    logger.debug("Error processing %s: %s", format_name, e)
+                    continue
+                if file_paths:
+                    return file_paths
+        
+        # Handle plain text that might be a file path; multi-line text never is one
         if mime_data.hasText():
             text = mime_data.text().strip()
-            logger.debug(f"Checking text content for file path: {text[:100]}...")
+            if '\n' in text:
+                logger.debug("Text content spans multiple lines, not a file path")
+                return []
+            logger.debug("Checking text content for file path: %.100s...", text)
             result = self.is_file_path(text)
             if result:
-                logger.debug(f"Text content is a valid file path: {result}")
-                return result
+                logger.debug("Text content is a valid file path: %s", result)
+                return [result]
             else:
                 logger.debug("Text content is not a valid file path")
         else:
             logger.debug("No text content in mime data")
             
         logger.debug("No file detected from clipboard")
-        return None
+        return []
     
-    def create_file_mime_data(self, file_path):
+    def _file_paths_from_uri_bytes(self, raw, dbg=False):
+        """Return the existing files named by file:// lines in raw URI-list bytes."""
+        file_paths = []
+        for match in _FILE_URI_RE.finditer(raw):
+            file_path = os.fsdecode(unquote_to_bytes(match.group(1)))
+            if os.path.isfile(file_path):
+                file_paths.append(file_path)
+            elif dbg:
+                logger.debug("File does not exist: %s", file_path)
+        if dbg:
+            logger.debug("Confirmed files: %s", file_paths)
+        return file_paths
+    
+    def create_file_mime_data(self, file_path, *more_paths):
         """Create QMimeData with proper file metadata."""
         mime_data = QMimeData()
+        file_paths = [file_path, *more_paths]
         
         file_url = QUrl.fromLocalFile(file_path)
-        mime_data.setUrls([file_url])
-        mime_data.setText(file_path)
+        mime_data.setUrls([QUrl.fromLocalFile(path) for path in file_paths])
+        mime_data.setText("\n".join(file_paths))
         try:
-            file_list = f"file:///{file_path.replace(os.sep, '/')}\n"
+            file_list = "".join(f"file:///{path.replace(os.sep, '/')}\n" for path in file_paths)
             mime_data.setData("text/uri-list", file_list.encode('utf-8'))
             mime_data.setData("text/x-moz-url", f"{file_url.toString()}\n{os.path.basename(file_path)}".encode('utf-8'))
             mime_data.setData("application/x-kde-cutselection", b"0")  # 0 means copy, 1 means cut
             
         except Exception as e:
-            logger.debug(f"Could not set additional file formats: {e}")
+            logger.debug("Could not set additional file formats: %s", e)
         
         return mime_data
     
     def process_file_content(self, text):
         """Process file content for auto file linking."""
-        if not self.settings.value("auto_file_link", False, bool):
+        if not self._cfg_auto_file_link:
             return text
         
         file_path = self.is_file_path(text)
         if not file_path:
             return text
         
-        target_dir = self.settings.value("target_directory", ROOT, str)
-        use_symlink = self.settings.value("use_symlink", False, bool)
+        target_dir = self._cfg_target_directory
+        use_symlink = self._cfg_use_symlink
         
         linked_path = self.create_file_link(file_path, target_dir, use_symlink)
         if linked_path:
-            logger.debug(f"File linked successfully: {file_path} -> {linked_path}")
+            logger.debug("File linked successfully: %s -> %s", file_path, linked_path)
             return linked_path
         else:
-            logger.debug(f"File linking failed, returning original path: {file_path}")
+            logger.debug("File linking failed, returning original path: %s", file_path)
             return text
     
     def handle_file_paste(self, mime_data):
-        """Handle file paste immediately when detected."""
+        """Handle file paste immediately when detected.
+        
+        Returns True once a file is detected; the link is then created on a worker
+        thread and the pasted text is inserted as-is if linking fails.
+        """
         logger.debug("handle_file_paste called")
-        if not self.settings.value("auto_file_link", False, bool):
+        if not self._cfg_auto_file_link:
             logger.debug("auto_file_link is disabled, not handling file paste")
             return False
         
-        file_path = self.detect_file_from_clipboard(mime_data)
-        if not file_path:
+        file_paths = self.detect_files_from_clipboard(mime_data)
+        if not file_paths:
             logger.debug("No file path detected from clipboard")
             return False
         
-        logger.info(f"File detected from clipboard: {file_path}")
-        target_dir = self.settings.value("target_directory", ROOT, str)
-        use_symlink = self.settings.value("use_symlink", False, bool)
-        logger.debug(f"Target directory: {target_dir}, use_symlink: {use_symlink}")
+        logger.info("Files detected from clipboard: %s", file_paths)
+        target_dir = self._cfg_target_directory
+        use_symlink = self._cfg_use_symlink
+        logger.debug("Target directory: %s, use_symlink: %s", target_dir, use_symlink)
         
-        linked_path = self.create_file_link(file_path, target_dir, use_symlink)
-        if linked_path:
-            logger.info(f"File automatically linked: {file_path} -> {linked_path}")
-            clipboard = QApplication.clipboard()
-            if clipboard:
-                if self.settings.value("preserve_clipboard", True, bool):
-                    original_mime_data = clipboard.mimeData()
-                    if original_mime_data:
-                        copied_mime_data = QMimeData()
-                        for format_name in original_mime_data.formats():
-                            copied_mime_data.setData(format_name, original_mime_data.data(format_name))
-                
-                new_mime_data = self.create_file_mime_data(linked_path)
-                clipboard.setMimeData(new_mime_data)
-            
-            self.text_edit.setPlainText(shorten_path(linked_path))
-            if self.settings.value("auto_paste", True, bool):
-                def delayed_enter():
-                    import time
-                    time.sleep(0.05)
-                    self.execute_enter_logic()
-                threading.Thread(target=delayed_enter, daemon=True).start()
-            return True
-        else:
-            logger.debug(f"File paste handled but link creation failed for: {file_path}")
-            return False
+        job = LinkJob(file_paths, target_dir, use_symlink,
+                      fallback_text=mime_data.text() if mime_data.hasText() else "")
+        self._start_link_job(job)
+        return True
+    
+    def _finish_file_paste(self, linked):
+        """Put the linked files on the clipboard and, if the box is still open, into it."""
+        for file_path, linked_path in linked:
+            logger.info("File automatically linked: %s -> %s", file_path, linked_path)
+        linked_paths = [linked_path for _, linked_path in linked]
+        clipboard = QApplication.clipboard()
+        original_clipboard_data = None
+        if clipboard:
+            if self._cfg_auto_paste and self._cfg_preserve_clipboard:
+                original_clipboard_data = _snapshot_mime(clipboard.mimeData())
+            new_mime_data = self.create_file_mime_data(*linked_paths)
+            clipboard.setMimeData(new_mime_data)
+        
+        if not self.isVisible():
+            # Dismissed while the links were being created: keep the saved state, and never
+            # send a synthetic paste into whatever window has focus now
+            logger.debug("Input box hidden before linking finished, only updating the clipboard")
+            return
+        self.text_edit.setPlainText(" ".join(shorten_path(path) for path in linked_paths))
+        if self._cfg_auto_paste and clipboard:
+            # Paste the file mime data directly: the Enter path would re-parse the joined
+            # text, fail to find a file for several paths and overwrite it with plain text
+            self.clear_saved_state()
+            self.hide()
+            self.auto_paste(original_clipboard_data)
     
     def execute_enter_logic(self):
         """Execute the logic that happens when Enter is pressed."""
         raw_text = self.text_edit.toPlainText()
         cleaned_text = self.clean_text(raw_text)
-        if cleaned_text and not re.match(r'^\s*$', cleaned_text):
-            logger.debug(f"Processing text input: {len(cleaned_text)} characters")
+        if cleaned_text:  # clean_text drops blank edge lines, so non-empty means non-blank
+            logger.debug("Processing text input: %s characters", len(cleaned_text))
             
             clipboard = QApplication.clipboard()
             if clipboard:
                 original_clipboard_data = None
-                if (self.settings.value("auto_paste", True, bool) and 
-                    self.settings.value("preserve_clipboard", True, bool)):
-                    original_mime_data = clipboard.mimeData()
-                    if original_mime_data:
-                        copied_mime_data = QMimeData()
-                        for format_name in original_mime_data.formats():
-                            copied_mime_data.setData(format_name, original_mime_data.data(format_name))
-                        original_clipboard_data = copied_mime_data
+                if self._cfg_auto_paste and self._cfg_preserve_clipboard:
+                    original_clipboard_data = _snapshot_mime(clipboard.mimeData())
                 
                 expanded_text = expand_path(cleaned_text)
                 if os.path.isfile(expanded_text):
@@ -946,24 +1267,24 @@ class InputDialog(QWidget):
         self.hide()
     
     def auto_paste(self, original_clipboard_data=None):
-        if self.settings.value("auto_paste", True, bool):
+        if self._cfg_auto_paste:
+            # Timers keep the clipboard on the UI thread and let the dialog hide before Ctrl+V
             def paste_action():
-                import time
-                time.sleep(0.1)
-                
                 kb = keyboard.Controller()
                 kb.press(Key.ctrl)
                 kb.press('v')
                 kb.release('v')
                 kb.release(Key.ctrl)
                 if (original_clipboard_data is not None and 
-                    self.settings.value("preserve_clipboard", True, bool)):
-                    time.sleep(0.2)
-                    clipboard = QApplication.clipboard()
-                    if clipboard:
-                        clipboard.setMimeData(original_clipboard_data)
+                    self._cfg_preserve_clipboard):
+                    QTimer.singleShot(200, restore_clipboard)
             
-            threading.Thread(target=paste_action, daemon=True).start()
+            def restore_clipboard():
+                clipboard = QApplication.clipboard()
+                if clipboard:
+                    clipboard.setMimeData(original_clipboard_data)
+            
+            QTimer.singleShot(100, paste_action)
     
     def is_dark_mode(self):
         palette = QApplication.palette()
@@ -971,31 +1292,27 @@ class InputDialog(QWidget):
         return bg_color.value() < 128
     
     def update_theme(self):
-        if self.is_dark_mode():
-            self.text_edit.setStyleSheet("""
-                QTextEdit {
-                    border: 2px solid #3498db;
-                    border-radius: 8px;
-                    padding: 8px;
-                    font-size: 14px;
-                    background-color: #2b2b2b;
-                    color: white;
-                }
-            """)
-        else:
-            self.text_edit.setStyleSheet("""
-                QTextEdit {
-                    border: 2px solid #3498db;
-                    border-radius: 8px;
-                    padding: 8px;
-                    font-size: 14px;
-                    background-color: white;
-                    color: black;
-                }
-            """)
+        dark = self.is_dark_mode()
+        if dark == self._last_theme_dark:
+            return  # Avoid a needless stylesheet re-polish on every show
+        self._last_theme_dark = dark
+        self.text_edit.setStyleSheet(_DARK_QSS if dark else _LIGHT_QSS)
         
+    def closeEvent(self, a0):
+        self._flush_created_links()
+        super().closeEvent(a0)
+    
+    def _reload_cfg(self):
+        """Cache the settings read on every paste/Enter; call again after the settings change."""
+        self._cfg_auto_paste = self.settings.value("auto_paste", True, bool)
+        self._cfg_preserve_clipboard = self.settings.value("preserve_clipboard", True, bool)
+        self._cfg_auto_file_link = self.settings.value("auto_file_link", False, bool)
+        self._cfg_target_directory = self.settings.value("target_directory", ROOT, str)
+        self._cfg_use_symlink = self.settings.value("use_symlink", False, bool)
+    
     def showEvent(self, a0):
         super().showEvent(a0)
+        self._reload_cfg()
         self.update_theme()
         screen = QApplication.primaryScreen()
         if screen:
@@ -1005,7 +1322,7 @@ class InputDialog(QWidget):
         
         # Trigger focus gained callback
         if self.app:
-            plugin_manager = get_plugin_manager()
+            plugin_manager = _pm()
             if plugin_manager:
                 context = CallbackContext(
                     app=self.app, 
@@ -1035,7 +1352,7 @@ class InputDialog(QWidget):
                     else:
                         # Trigger enter pressed callback
                         if self.app:
-                            plugin_manager = get_plugin_manager()
+                            plugin_manager = _pm()
                             if plugin_manager:
                                 context = CallbackContext(
                                     app=self.app, 
@@ -1049,7 +1366,7 @@ class InputDialog(QWidget):
                 elif key_event.key() == Qt.Key.Key_Escape:
                     # Trigger escape pressed callback
                     if self.app:
-                        plugin_manager = get_plugin_manager()
+                        plugin_manager = _pm()
                         if plugin_manager:
                             context = CallbackContext(
                                 app=self.app, 
@@ -1070,9 +1387,9 @@ class InputDialog(QWidget):
             if not self.isActiveWindow() and self.isVisible():
                 logger.debug("Window lost activation - auto-hiding")
                 # Use QTimer to delay slightly in case it's just a temporary focus change
-                from PyQt6.QtCore import QTimer
                 QTimer.singleShot(50, self._check_and_hide_on_focus_loss)
     
+    @pyqtSlot()
     def _check_and_hide_on_focus_loss(self):
         """Check if dialog should be hidden due to focus loss."""
         # Only hide if the dialog is still visible and doesn't have focus
@@ -1081,7 +1398,7 @@ class InputDialog(QWidget):
             
             # Trigger focus lost callback
             if self.app:
-                plugin_manager = get_plugin_manager()
+                plugin_manager = _pm()
                 if plugin_manager:
                     context = CallbackContext(
                         app=self.app, 
@@ -1095,8 +1412,9 @@ class InputDialog(QWidget):
     def adjustSize(self):
         document = self.text_edit.document()
         if document:
-            doc_size = document.size()
-            doc_height = doc_size.height()
+            # QPlainTextEdit's document layout reports its height in lines, not pixels
+            line_count = document.size().height()
+            doc_height = line_count * self.text_edit.fontMetrics().lineSpacing() + 2 * document.documentMargin()
             self.text_edit.setFixedHeight(max(50, min(300, int(doc_height + 20))))
         super().adjustSize()
     
@@ -1108,7 +1426,7 @@ class InputDialog(QWidget):
                 icon = QIcon(icon_path)
                 if not icon.isNull():
                     self.setWindowIcon(icon)
-                    logger.debug(f"Using window icon from {icon_path}")
+                    logger.debug("Using window icon from %s", icon_path)
                     return
                 else:
                     logger.warning(f"Icon file exists but failed to load: {icon_path}")
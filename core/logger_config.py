@@ -2,8 +2,8 @@
 Centralized logging configuration for the input-box application.
 """
 import os
+import sys
 import logging
-import inspect
 from logging.handlers import RotatingFileHandler
 
 
@@ -39,25 +39,29 @@ class EnhancedLogger:
     def __init__(self, name: str):
         self.logger = logging.getLogger(name)
     
+    def isEnabledFor(self, level) -> bool:
+        return self.logger.isEnabledFor(level)
+    
     def _log_with_location(self, level, msg, *args, **kwargs):
         """Internal method to log with automatic file/line detection"""
-        frame = inspect.currentframe()
+        if not self.logger.isEnabledFor(level):
+            return
         try:
-            caller_frame = frame.f_back.f_back if frame and frame.f_back else None
-            if caller_frame:
-                filename = os.path.basename(caller_frame.f_code.co_filename)
-                lineno = caller_frame.f_lineno
-                
-                record = self.logger.makeRecord(
-                    self.logger.name, level, caller_frame.f_code.co_filename, lineno,
-                    msg, args, None, func=caller_frame.f_code.co_name
-                )
-                record.filename = filename
-                self.logger.handle(record)
-            else:
-                self.logger.log(level, msg, *args, **kwargs)
-        finally:
-            del frame
+            caller_frame = sys._getframe(2)  # Skip this method and the level wrapper
+        except ValueError:
+            caller_frame = None
+        if caller_frame:
+            filename = os.path.basename(caller_frame.f_code.co_filename)
+            lineno = caller_frame.f_lineno
+            
+            record = self.logger.makeRecord(
+                self.logger.name, level, caller_frame.f_code.co_filename, lineno,
+                msg, args, None, func=caller_frame.f_code.co_name
+            )
+            record.filename = filename
+            self.logger.handle(record)
+        else:
+            self.logger.log(level, msg, *args, **kwargs)
     
     def debug(self, msg, *args, **kwargs):
         self._log_with_location(logging.DEBUG, msg, *args, **kwargs)
@@ -94,17 +98,16 @@ def clear_log_file(log_file_path: str) -> bool:
 
 def get_log_file_size(log_file_path: str) -> str:
     try:
-        if not os.path.exists(log_file_path):
-            return "0 B"
-        
-        size = os.path.getsize(log_file_path)
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+        size = os.stat(log_file_path).st_size
+    except FileNotFoundError:
+        return "0 B"
     except Exception:
         return "Unknown"
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
 
 
 def update_log_level(log_level: int):
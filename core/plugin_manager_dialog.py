@@ -2,12 +2,13 @@
 Plugin management dialog for InputBox application.
 """
 import os
+import math
 from typing import TYPE_CHECKING, Any
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QCheckBox, QScrollArea, QWidget,
                              QFrame, QMessageBox, QTextEdit, QSizePolicy)
-from PyQt6.QtGui import QFont, QIcon, QFontMetrics
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QIcon, QPixmap, QPainter, QColor, QFontMetricsF
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot
 
 if TYPE_CHECKING:
     from .app import TrayInputApp
@@ -16,6 +17,96 @@ from .tools import ROOT
 from interface import CallbackContext
 from plugins import get_plugin_manager
 
+_window_icon: QIcon | None = None
+_window_icon_loaded = False
+
+
+def _get_window_icon() -> QIcon | None:
+    """Return ROOT/icon.png as a QIcon, decoding it only on the first call."""
+    global _window_icon, _window_icon_loaded
+    if not _window_icon_loaded:
+        _window_icon_loaded = True
+        icon_path = os.path.join(ROOT, "icon.png")
+        if os.path.exists(icon_path):
+            try:
+                pixmap = QPixmap(icon_path)
+                if not pixmap.isNull():
+                    _window_icon = QIcon(pixmap)
+            except Exception:
+                pass
+    return _window_icon
+
+
+class PluginInfoArea(QWidget):
+    """Paints a plugin's name, description and status lines, each elided to the widget width."""
+    
+    LINE_SPACING = 2
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont()
+        self.name_font.setPointSize(11)
+        self.name_font.setBold(True)
+        self.desc_font = QFont()
+        self.desc_font.setPointSize(9)
+        self.status_font = QFont()
+        self.status_font.setPointSize(9)
+        self.status_font.setBold(True)
+        # Fractional metrics: integer advances are rounded and can misjudge whether text fits on HiDPI
+        self._name_metrics = QFontMetricsF(self.name_font)
+        self._desc_metrics = QFontMetricsF(self.desc_font)
+        self._status_metrics = QFontMetricsF(self.status_font)
+        self._lines: list[tuple[str, QFont, QFontMetricsF, QColor | None, float]] = []  # (text, font, metrics, colour, full width)
+        self._elided: list[str] = []
+        self._elided_width = -1
+    
+    def set_lines(self, name: str, desc: str, status: str):
+        """Set the texts to show; empty description or status lines are omitted."""
+        lines = [(name, self.name_font, self._name_metrics, None)]
+        if desc:
+            lines.append((desc, self.desc_font, self._desc_metrics, QColor("#666")))
+        if status:
+            lines.append((status, self.status_font, self._status_metrics, QColor("#999")))
+        if [line[:2] for line in lines] == [line[:2] for line in self._lines]:
+            return
+        # Measure each text once so widths that fit it can skip elidedText entirely
+        self._lines = [(text, font, metrics, color, metrics.horizontalAdvance(text))
+                       for text, font, metrics, color in lines]
+        self._elided_width = -1
+        self.update()
+    
+    def _elide_lines(self):
+        """Recompute elided texts and the tooltip; only needed when the width or texts change."""
+        width = self.contentsRect().width()
+        if width == self._elided_width:
+            return
+        self._elided_width = width
+        self._elided = [text if full_width <= width
+                        else metrics.elidedText(text, Qt.TextElideMode.ElideRight, width)
+                        for text, _, metrics, _, full_width in self._lines]
+        is_elided = any(full_width > width for *_, full_width in self._lines)
+        self.setToolTip("\n".join(line[0] for line in self._lines) if is_elided else "")
+    
+    def resizeEvent(self, a0):
+        super().resizeEvent(a0)
+        self._elide_lines()
+    
+    def paintEvent(self, a0):
+        self._elide_lines()
+        rect = self.contentsRect()
+        heights = [math.ceil(metrics.height()) for _, _, metrics, _, _ in self._lines]
+        total_height = sum(heights) + self.LINE_SPACING * (len(heights) - 1)
+        y = rect.top() + max(0, (rect.height() - total_height) // 2)
+        
+        painter = QPainter(self)
+        default_color = self.palette().color(self.foregroundRole())
+        for (_, font, _, color, _), elided, height in zip(self._lines, self._elided, heights):
+            painter.setFont(font)
+            painter.setPen(color or default_color)
+            painter.drawText(rect.left(), y, rect.width(), height,
+                             (Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter).value, elided)
+            y += height + self.LINE_SPACING
+
 
 class PluginWidget(QFrame):
     """Widget representing a single plugin in the list."""
@@ -23,9 +114,12 @@ class PluginWidget(QFrame):
     toggled = pyqtSignal(str, bool)  # plugin_name, enabled
     settings_requested = pyqtSignal(str)  # plugin_name
     
+    _controls_width: int | None = None  # Same checkbox and button in every row, so measured once
+    
     def __init__(self, plugin_info: dict[str, Any], parent=None):
         super().__init__(parent)
         self.plugin_info = plugin_info
+        self._desc_text = self._build_desc_text(plugin_info)  # Rebuilt only when the plugin info is replaced
         self.setup_ui()
     
     def setup_ui(self):
@@ -56,58 +150,19 @@ class PluginWidget(QFrame):
         self.settings_btn.clicked.connect(self._on_settings_clicked)
         
         # Disable settings if plugin has no settings
-        plugin_instance = self.plugin_info['plugin_instance']
-        has_settings = (plugin_instance.settings is not None or 
-                       plugin_instance.settings_schema is not None or 
-                       bool(plugin_instance.default_settings))
-        self.settings_btn.setEnabled(has_settings)
+        self.settings_btn.setEnabled(self._has_settings(self.plugin_info))
         
         controls_layout.addWidget(self.settings_btn)
         
         # Create controls widget with fixed size
         self.controls_widget = QWidget()
         self.controls_widget.setLayout(controls_layout)
-        controls_hint = self.controls_widget.sizeHint()
-        self.controls_widget.setFixedWidth(controls_hint.width() + 20)
-        
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(2)
-        info_layout.setContentsMargins(0, 0, 0, 0)
+        if PluginWidget._controls_width is None:
+            PluginWidget._controls_width = self.controls_widget.sizeHint().width() + 20
+        self.controls_widget.setFixedWidth(PluginWidget._controls_width)
         
-        self.name_label = QLabel()
-        name_font = QFont()
-        name_font.setPointSize(11)
-        name_font.setBold(True)
-        self.name_label.setFont(name_font)
-        self.name_label.setWordWrap(False)
-        name_size_policy = QSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
-        self.name_label.setSizePolicy(name_size_policy)
-        info_layout.addWidget(self.name_label)
-        
-        # Plugin description and version (small font)
-        self.desc_label = QLabel()
-        desc_font = QFont()
-        desc_font.setPointSize(9)
-        self.desc_label.setFont(desc_font)
-        self.desc_label.setStyleSheet("color: #666;")
-        self.desc_label.setWordWrap(False)
-        desc_size_policy = QSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
-        self.desc_label.setSizePolicy(desc_size_policy)
-        info_layout.addWidget(self.desc_label)
-        
-        # Status indicator for disabled plugins
-        self.status_label = QLabel()
-        status_font = QFont()
-        status_font.setPointSize(9)
-        status_font.setBold(True)
-        self.status_label.setFont(status_font)
-        self.status_label.setWordWrap(False)
-        status_size_policy = QSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
-        self.status_label.setSizePolicy(status_size_policy)
-        info_layout.addWidget(self.status_label)
-        
-        self.info_widget = QWidget()
-        self.info_widget.setLayout(info_layout)
+        # Name, description and status are painted by one widget instead of three labels
+        self.info_widget = PluginInfoArea()
         info_size_policy = QSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
         self.info_widget.setSizePolicy(info_size_policy)
         layout.addWidget(self.info_widget, 1)  # stretch=1，floating width
@@ -115,82 +170,36 @@ class PluginWidget(QFrame):
         self.setLayout(layout)
         self.update_text()
     
-    def update_text(self):
-        """Update text content based on current widget size."""
-        total_width = self.width()
-        controls_width = self.controls_widget.width()
-        margins = 20
-        available_width = max(50, total_width - controls_width - margins)
-        
+    @staticmethod
+    def _has_settings(plugin_info: dict[str, Any]) -> bool:
+        plugin_instance = plugin_info['plugin_instance']
+        return (plugin_instance.settings is not None or 
+                plugin_instance.settings_schema is not None or 
+                bool(plugin_instance.default_settings))
+    
+    @staticmethod
+    def _build_desc_text(plugin_info: dict[str, Any]) -> str:
+        """Join version, author and description into the secondary line."""
         desc_parts = []
-        if self.plugin_info.get('version'):
-            desc_parts.append(f"v{self.plugin_info['version']}")
-        if self.plugin_info.get('author'):
-            desc_parts.append(f"by {self.plugin_info['author']}")
-        
-        if desc_parts:
-            desc_text = " • ".join(desc_parts)
-        else:
-            desc_text = ""
-            
-        if self.plugin_info.get('description'):
-            if desc_text:
-                desc_text += " • "
-            desc_text += self.plugin_info['description']
-        
-        name_text = self.plugin_info['name']
-        truncated_name = self._truncate_text_to_width(name_text, available_width, self.name_label.font())
-        self.name_label.setText(truncated_name)
-        if truncated_name != name_text:
-            self.name_label.setToolTip(name_text)
-        else:
-            self.name_label.setToolTip("")
-        
-        if desc_text:
-            truncated_desc = self._truncate_text_to_width(desc_text, available_width, self.desc_label.font())
-            self.desc_label.setText(truncated_desc)
-            if truncated_desc != desc_text:
-                self.desc_label.setToolTip(desc_text)
-            else:
-                self.desc_label.setToolTip("")
-            self.desc_label.setVisible(True)
-        else:
-            self.desc_label.setVisible(False)
-        
-        if not self.plugin_info['enabled']:
-            status_text = "(Disabled)"
-            truncated_status = self._truncate_text_to_width(status_text, available_width, self.status_label.font())
-            self.status_label.setText(truncated_status)
-            self.status_label.setStyleSheet("color: #999; font-weight: bold;")
-            if truncated_status != status_text:
-                self.status_label.setToolTip(status_text)
-            else:
-                self.status_label.setToolTip("")
-            self.status_label.setVisible(True)
-        else:
-            self.status_label.setVisible(False)
+        if plugin_info.get('version'):
+            desc_parts.append(f"v{plugin_info['version']}")
+        if plugin_info.get('author'):
+            desc_parts.append(f"by {plugin_info['author']}")
+        if plugin_info.get('description'):
+            desc_parts.append(plugin_info['description'])
+        return " • ".join(desc_parts)
     
-    def _truncate_text_to_width(self, text: str, max_width: int, font: QFont) -> str:
-        """Truncate text to fit within specified width."""
-        metrics = QFontMetrics(font)
-        
-        if metrics.horizontalAdvance(text) <= max_width:
-            return text
-        left, right = 0, len(text)
-        while left < right:
-            mid = (left + right + 1) // 2
-            test_text = text[:mid] + "..."
-            if metrics.horizontalAdvance(test_text) <= max_width:
-                left = mid
-            else:
-                right = mid - 1
-        
-        return text[:left] + "..." if left > 0 else "..."
+    def update_text(self):
+        """Update the displayed text; the info area elides it to its current width itself."""
+        status_text = "" if self.plugin_info['enabled'] else "(Disabled)"
+        self.info_widget.set_lines(self.plugin_info['name'], self._desc_text, status_text)
     
+    @pyqtSlot(bool)
     def _on_toggled(self, checked: bool):
         """Handle checkbox toggle."""
         self.toggled.emit(self.plugin_info['name'], checked)
     
+    @pyqtSlot()
     def _on_settings_clicked(self):
         """Handle settings button click."""
         self.settings_requested.emit(self.plugin_info['name'])
@@ -201,11 +210,12 @@ class PluginWidget(QFrame):
         self.checkbox.setChecked(enabled)
         self.update_text()  # Update status display
     
-    def resizeEvent(self, a0):
-        """Handle resize events to update text truncation."""
-        super().resizeEvent(a0)
-        if hasattr(self, 'name_label'):
-            self.update_text()
+    def set_plugin_info(self, plugin_info: dict[str, Any]):
+        """Show freshly loaded info for the same plugin, keeping the existing row."""
+        self.plugin_info = plugin_info
+        self._desc_text = self._build_desc_text(plugin_info)
+        self.settings_btn.setEnabled(self._has_settings(plugin_info))
+        self.update_enabled_state(plugin_info['enabled'])
 
 
 class PluginSettingsDialog(QDialog):
@@ -226,7 +236,9 @@ class PluginSettingsDialog(QDialog):
         info_frame = QFrame()
         info_frame.setFrameStyle(QFrame.Shape.StyledPanel)
         info_layout = QVBoxLayout()
+        # Plugin metadata is shown as plain text: no rich-text detection or HTML layout
         name_label = QLabel(self.plugin_info['name'])
+        name_label.setTextFormat(Qt.TextFormat.PlainText)
         name_font = QFont()
         name_font.setPointSize(14)
         name_font.setBold(True)
@@ -234,12 +246,15 @@ class PluginSettingsDialog(QDialog):
         info_layout.addWidget(name_label)
         
         version_label = QLabel(f"Version: {self.plugin_info['version']}")
+        version_label.setTextFormat(Qt.TextFormat.PlainText)
         info_layout.addWidget(version_label)
         author_label = QLabel(f"Author: {self.plugin_info['author']}")
+        author_label.setTextFormat(Qt.TextFormat.PlainText)
         info_layout.addWidget(author_label)
         
         if self.plugin_info['description']:
             desc_label = QLabel(f"Description: {self.plugin_info['description']}")
+            desc_label.setTextFormat(Qt.TextFormat.PlainText)
             desc_label.setWordWrap(True)
             info_layout.addWidget(desc_label)
         
@@ -302,6 +317,8 @@ class PluginManagerDialog(QDialog):
         self.app = parent
         self.plugin_manager = get_plugin_manager()
         self.plugin_widgets: dict[str, PluginWidget] = {}
+        self.plugin_infos: dict[str, dict[str, Any]] = {}  # plugin_name -> info from the last load
+        self._settings_dialogs: dict[str, PluginSettingsDialog] = {}  # Built on first click, reused after
         self.pending_changes: dict[str, bool] = {}  # plugin_name -> enabled_state
         self.original_states: dict[str, bool] = {}  # Store original states
         self.setup_ui()
@@ -314,9 +331,10 @@ class PluginManagerDialog(QDialog):
             return
         
         changes = self.plugin_manager.check_for_plugin_changes()
+        if changes.get('renamed') or changes['deleted']:
+            context = CallbackContext(app=self.app, logger=self.plugin_manager.logger)
         
         if changes.get('renamed'):
-            context = CallbackContext(app=self.app, logger=self.plugin_manager.logger)
             renamed_names = self.plugin_manager.handle_renamed_plugins(changes['renamed'], context)
             
             if renamed_names:
@@ -327,7 +345,6 @@ class PluginManagerDialog(QDialog):
                 )
         
         if changes['deleted']:
-            context = CallbackContext(app=self.app, logger=self.plugin_manager.logger)
             deleted_names = self.plugin_manager.handle_deleted_plugins(changes['deleted'], context)
             if deleted_names:
                 deleted_list = '\n'.join(f"• {name}" for name in deleted_names)
@@ -350,14 +367,9 @@ class PluginManagerDialog(QDialog):
         self.setModal(True)
         self.resize(700, 600)
         
-        icon_path = os.path.join(ROOT, "icon.png")
-        if os.path.exists(icon_path):
-            try:
-                icon = QIcon(icon_path)
-                if not icon.isNull():
-                    self.setWindowIcon(icon)
-            except Exception:
-                pass
+        icon = _get_window_icon()
+        if icon is not None:
+            self.setWindowIcon(icon)
         
         layout = QVBoxLayout()
         
@@ -409,49 +421,76 @@ class PluginManagerDialog(QDialog):
         self.setLayout(layout)
     
     def load_plugins(self):
-        """Load and display all plugins."""
+        """Load and display all plugins, reusing the rows of plugins that are still present."""
+        plugins_info = self.plugin_manager.get_all_plugins_info() if self.plugin_manager else []
+        present = {plugin_info['name'] for plugin_info in plugins_info}
+        for name in [name for name in self.plugin_widgets if name not in present]:
+            stale_widget = self.plugin_widgets.pop(name)
+            stale_widget.hide()
+            stale_widget.deleteLater()
+            self.plugin_infos.pop(name, None)
+            stale_dialog = self._settings_dialogs.pop(name, None)
+            if stale_dialog is not None:
+                stale_dialog.deleteLater()
+        
+        # Detach everything from the layout; kept rows are re-added below in the new order
+        while self.plugins_layout.count():
+            child = self.plugins_layout.takeAt(0)
+            widget = child.widget() if child else None
+            if widget is not None and not isinstance(widget, PluginWidget):
+                widget.deleteLater()  # Placeholder label from a previous load
+        
         if not self.plugin_manager:
             no_manager_label = QLabel("Plugin manager not available.")
             no_manager_label.setStyleSheet("color: red; font-style: italic;")
             self.plugins_layout.addWidget(no_manager_label)
             return
         
-        plugins_info = self.plugin_manager.get_all_plugins_info()
-        
         if not plugins_info:
             no_plugins_label = QLabel("No plugins found.")
             no_plugins_label.setStyleSheet("color: #666; font-style: italic;")
             self.plugins_layout.addWidget(no_plugins_label)
             return
         
-        plugins_info.sort(key=lambda p: (not p['enabled'], p['name'].lower()))
+        # key= already computes each key once per item; casefold handles non-ASCII names
+        plugins_info.sort(key=lambda p: (not p['enabled'], p['name'].casefold()))
         
-        for plugin_info in plugins_info:
-            self.original_states[plugin_info['name']] = plugin_info['enabled']
-            widget = PluginWidget(plugin_info, self)
-            widget.toggled.connect(self.on_plugin_toggled)
-            widget.settings_requested.connect(self.on_plugin_settings_requested)
+        # Defer painting until every row is added so the layout settles in one pass
+        updates_were_enabled = self.plugins_widget.updatesEnabled()
+        self.plugins_widget.setUpdatesEnabled(False)
+        try:
+            for plugin_info in plugins_info:
+                self.original_states[plugin_info['name']] = plugin_info['enabled']
+                widget = self.plugin_widgets.get(plugin_info['name'])
+                if widget is not None:
+                    widget.set_plugin_info(plugin_info)
+                else:
+                    widget = PluginWidget(plugin_info, self)
+                    widget.toggled.connect(self.on_plugin_toggled)
+                    widget.settings_requested.connect(self.on_plugin_settings_requested)
+                    self.plugin_widgets[plugin_info['name']] = widget
+                
+                self.plugin_infos[plugin_info['name']] = plugin_info
+                self.plugins_layout.addWidget(widget)
             
-            self.plugin_widgets[plugin_info['name']] = widget
-            self.plugins_layout.addWidget(widget)
-        
-        self.plugins_layout.addStretch()
+            self.plugins_layout.addStretch()
+        finally:
+            self.plugins_widget.setUpdatesEnabled(updates_were_enabled)
+            self.plugins_widget.updateGeometry()
     
     def refresh_plugins(self):
         """Refresh the plugin list."""
-        for widget in self.plugin_widgets.values():
-            widget.deleteLater()
-        self.plugin_widgets.clear()
+        self.plugins_widget.setUpdatesEnabled(False)
+        try:
+            self._rebuild_plugin_list()
+        finally:
+            self.plugins_widget.setUpdatesEnabled(True)
+            self.plugins_widget.updateGeometry()
+    
+    def _rebuild_plugin_list(self):
         self.pending_changes.clear()
         self.original_states.clear()
         
-        while self.plugins_layout.count():
-            child = self.plugins_layout.takeAt(0)
-            if child and child.widget():
-                widget = child.widget()
-                if widget:
-                    widget.deleteLater()
-        
         if self.plugin_manager:
             self.plugin_manager.load_plugins()
         
@@ -466,8 +505,7 @@ class PluginManagerDialog(QDialog):
         if enabled != original_state:
             self.pending_changes[plugin_name] = enabled
         else:
-            if plugin_name in self.pending_changes:
-                del self.pending_changes[plugin_name]
+            self.pending_changes.pop(plugin_name, None)
         widget = self.plugin_widgets.get(plugin_name)
         if widget:
             widget.update_enabled_state(enabled)
@@ -510,14 +548,7 @@ class PluginManagerDialog(QDialog):
     
     def on_plugin_settings_requested(self, plugin_name: str):
         """Handle plugin settings request."""
-        plugins_info = self.plugin_manager.get_all_plugins_info() if self.plugin_manager else []
-        
-        plugin_info = None
-        for info in plugins_info:
-            if info['name'] == plugin_name:
-                plugin_info = info
-                break
-        
+        plugin_info = self.plugin_infos.get(plugin_name)
         if not plugin_info:
             QMessageBox.warning(
                 self, "Error", 
@@ -525,5 +556,10 @@ class PluginManagerDialog(QDialog):
             )
             return
         
-        settings_dialog = PluginSettingsDialog(plugin_info, self)
+        settings_dialog = self._settings_dialogs.get(plugin_name)
+        if settings_dialog is None or settings_dialog.plugin_info is not plugin_info:
+            if settings_dialog is not None:
+                settings_dialog.deleteLater()  # Plugin was reloaded by a refresh
+            settings_dialog = PluginSettingsDialog(plugin_info, self)
+            self._settings_dialogs[plugin_name] = settings_dialog
         settings_dialog.exec()
@@ -1,11 +1,12 @@
 import sys
 import os
+import re
 import subprocess
 from PyQt6.QtWidgets import (QVBoxLayout, QDialog, QCheckBox, QLabel, QHBoxLayout,
                              QPushButton, QKeySequenceEdit, QMessageBox, QComboBox,
                              QFileDialog, QFrame)
 from PyQt6.QtGui import QKeySequence
-from PyQt6.QtCore import QSettings
+from PyQt6.QtCore import QTimer, QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -14,29 +15,105 @@ if TYPE_CHECKING:
 from .tools import *
 from .hotkey_manager import get_available_managers, get_auto_manager_name, get_manager_display_name
 
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_LOG_LEVEL_INDEX = {name: index for index, name in enumerate(_LOG_LEVELS)}  # Combo box row of each level
+_DISMISSAL_CHOICES = (  # (label, stored behavior) shared by the Esc and focus-loss combo boxes
+    ("Save content and cursor position", "content_and_cursor"),
+    ("Save content only", "content_only"),
+    ("Don't save anything", "no_save"),
+)
+
+# Locate the conda environment and base from sys.executable when CONDA_* variables are missing
+_CONDA_ENV_RE = re.compile(r'envs/([^/]+)/')
+_CONDA_ENVS_BASE_RE = re.compile(r'(.+?)/envs/')
+_CONDA_BIN_PYTHON_RE = re.compile(r'(.+?)/bin/python')
+
+_SYSTEMCTL_TIMEOUT = 10  # Seconds; keeps a stuck user bus from freezing the dialog
+# systemctl --user command lines for the input-box unit
+_SERVICE_NAME = 'input-box.service'
+_SYSTEMCTL_USER = ('systemctl', '--user')
+_CMD_SHOW_STATE = (*_SYSTEMCTL_USER, 'show', _SERVICE_NAME, '--property=LoadState,UnitFileState')
+_CMD_DAEMON_RELOAD = (*_SYSTEMCTL_USER, 'daemon-reload')
+_CMD_ENABLE = (*_SYSTEMCTL_USER, 'enable', _SERVICE_NAME)
+_CMD_ENABLE_NOW = (*_SYSTEMCTL_USER, 'enable', '--now', _SERVICE_NAME)
+_CMD_DISABLE = (*_SYSTEMCTL_USER, 'disable', _SERVICE_NAME)
+_CMD_STOP = (*_SYSTEMCTL_USER, 'stop', _SERVICE_NAME)
+_CMD_RESTART = (*_SYSTEMCTL_USER, 'restart', _SERVICE_NAME)
+_UNIT_PATH = os.path.expanduser("~/.config/systemd/user/input-box.service")
+_SERVICE_TEMPLATE = """[Unit]
+Description=Input Box - Quick Input Tool
+After=graphical-session.target
+Wants=graphical-session.target
+PartOf=graphical-session.target
+
+[Service]
+Type=simple
+Environment="DISPLAY={display}"
+Environment="XDG_RUNTIME_DIR=/run/user/{user_id}"
+Environment="HOME={home}"
+Environment="XDG_SESSION_TYPE={session_type}"
+Environment="WAYLAND_DISPLAY={wayland_display}"
+Environment="PATH={path}"
+ExecStart={exec_command}
+Restart=on-failure
+RestartSec=5
+WorkingDirectory={root}
+
+[Install]
+WantedBy=graphical-session.target
+"""
+
+
+# key -> (default, type) of every setting stored in input-box.config
+SETTINGS_SCHEMA = {
+    "enable_hotkey": (True, bool),
+    "hotkey": ("Ctrl+Q", str),
+    "hotkey_manager": ("auto", str),
+    "auto_paste": (True, bool),
+    "preserve_clipboard": (True, bool),
+    "log_level": ("WARNING", str),
+    "auto_file_link": (False, bool),
+    "target_directory": (ROOT, str),
+    "use_symlink": (False, bool),
+    "auto_startup": (True, bool),
+    "active_dismissal_behavior": ("content_and_cursor", str),
+    "passive_dismissal_behavior": ("follow_active", str),
+}
+
+
+def read_setting(key: str):
+    """Read a setting with the default and type declared in SETTINGS_SCHEMA."""
+    default, type_ = SETTINGS_SCHEMA[key]
+    return get_setting(key, default, type_)
+
+
+def read_all_settings() -> dict:
+    """Return every setting in SETTINGS_SCHEMA, using defaults for keys not stored yet."""
+    return {key: read_setting(key) for key in SETTINGS_SCHEMA}
+
 
 def load_and_validate_settings():
     """Load settings from file and validate/filter conflicting options."""
-    config_path = os.path.join(ROOT, "input-box.config")
-    settings = QSettings(config_path, QSettings.Format.IniFormat)
+    reload_settings()  # The file may have been edited since the last read
+    settings = get_settings_store()
     
     # Flag to track if we need to save after validation
     needs_save = False
     
     # Validate auto file linking dependency on auto paste
-    auto_file_link = settings.value("auto_file_link", False, bool)
-    auto_paste = settings.value("auto_paste", True, bool)
+    auto_file_link = read_setting("auto_file_link")
+    auto_paste = read_setting("auto_paste")
     
     if auto_file_link and not auto_paste:
         logger.warning("Auto file linking requires auto paste - disabling auto file linking")
-        settings.setValue("auto_file_link", False)
+        set_setting("auto_file_link", False)
         needs_save = True
     
     # Validate target directory exists
-    target_directory = settings.value("target_directory", ROOT, str)
+    target_directory = read_setting("target_directory")
     if not os.path.exists(target_directory):
         logger.warning(f"Target directory {target_directory} does not exist - falling back to ROOT")
-        settings.setValue("target_directory", ROOT)
+        set_setting("target_directory", ROOT)
         needs_save = True
     
     # Save if validation made changes
@@ -47,18 +124,108 @@ def load_and_validate_settings():
     return settings
 
 
-def save_settings_to_file(settings_dict):
-    """Save settings dictionary to file."""
-    config_path = os.path.join(ROOT, "input-box.config")
-    settings = QSettings(config_path, QSettings.Format.IniFormat)
+def save_settings_to_file(settings_dict, defer_sync=False):
+    """Save settings dictionary to file.
     
+    With defer_sync the values are stored in memory right away and written to disk from the
+    event loop, so a closing dialog does not wait for the file write.
+    """
+    store = get_settings_store()
+    changed = False
     for key, value in settings_dict.items():
-        settings.setValue(key, value)
+        # Skip values that are already stored so an unchanged save does not rewrite the file
+        if value is not None and store.contains(key) and get_setting(key, value, type(value)) == value:
+            continue
+        set_setting(key, value)
+        changed = True
     
-    settings.sync()
+    if not changed:
+        logger.debug("Settings unchanged, nothing to save")
+        return
+    if defer_sync:
+        QTimer.singleShot(0, store.sync)
+        logger.info("Settings saved, file write scheduled")
+        return
+    store.sync()
     logger.info("Settings saved to file")
 
 
+def _resolve_conda_exe(conda_base: str) -> str:
+    """Return the conda executable under a conda installation, preferring bin/ over condabin/."""
+    conda_exe = os.path.join(conda_base, 'bin', 'conda')
+    if os.path.exists(conda_exe):
+        return conda_exe
+    return os.path.join(conda_base, 'condabin', 'conda')
+
+
+def detect_conda_env() -> tuple[str | None, str | None]:
+    """Return (environment name, conda executable) for the running interpreter.
+    
+    Uses the CONDA_* variables when set, otherwise derives both from sys.executable.
+    """
+    conda_env = os.environ.get('CONDA_DEFAULT_ENV')
+    conda_prefix = os.environ.get('CONDA_PREFIX')
+    conda_exe = os.environ.get('CONDA_EXE')
+
+    if not conda_env or not conda_prefix or not conda_exe:
+        python_executable = sys.executable
+        if 'conda' in python_executable or 'anaconda' in python_executable:
+            env_match = _CONDA_ENV_RE.search(python_executable)
+            if env_match:
+                conda_env = env_match.group(1)
+                conda_base_match = _CONDA_ENVS_BASE_RE.search(python_executable)
+                if conda_base_match:
+                    conda_exe = _resolve_conda_exe(conda_base_match.group(1))
+            else:
+                base_match = _CONDA_BIN_PYTHON_RE.search(python_executable)
+                if base_match:
+                    conda_exe = _resolve_conda_exe(base_match.group(1))
+                    conda_env = 'base'
+    return conda_env, conda_exe
+
+
+def _systemctl(cmd, check=True, **kwargs) -> subprocess.CompletedProcess:
+    """Run a systemctl command line with the shared timeout; raises CalledProcessError on failure if check."""
+    return subprocess.run(cmd, check=check, timeout=_SYSTEMCTL_TIMEOUT, **kwargs)
+
+
+def query_service_state() -> dict[str, str]:
+    """Return the input-box service's LoadState and UnitFileState from one systemctl call.
+    
+    An empty dict means systemctl could not be queried.
+    """
+    if not os.path.exists(_UNIT_PATH):
+        return {'LoadState': 'not-found'}  # register_service only ever installs the unit here
+    state = {}
+    try:
+        result = _systemctl(_CMD_SHOW_STATE, check=False, capture_output=True, text=True)
+        if result.returncode == 0:
+            for line in result.stdout.splitlines():
+                key, sep, value = line.partition('=')
+                if sep:
+                    state[key] = value.strip()
+    except Exception as e:
+        logger.warning(f"Failed to query service state: {e}")
+    return state
+
+
+class QueryWorkerSignals(QObject):
+    finished = pyqtSignal(object)  # Return value of the query
+
+
+class QueryWorker(QRunnable):
+    """Runs a blocking query on the thread pool so the settings dialog opens without waiting on it."""
+    
+    def __init__(self, query, *args):
+        super().__init__()
+        self._query = query
+        self._args = args
+        self.signals = QueryWorkerSignals()  # Owned by the pool (auto-delete), so it outlives a closed dialog
+    
+    def run(self):
+        self.signals.finished.emit(self._query(*self._args))
+
+
 class SettingsDialog(QDialog):
     def __init__(self, parent: "TrayInputApp"):
         super().__init__(None) # Must set to None
@@ -68,12 +235,15 @@ class SettingsDialog(QDialog):
         self.resize(400, 200)
         
         self.parent_app = parent
+        self._service_state: dict[str, str] | None = None  # systemctl properties, see _get_service_state
+        self._service_probe_pending = True  # auto_startup_cb still shows a placeholder
+        self._error_box: QMessageBox | None = None  # Created on the first error, see _show_error
         # Load and validate settings at initialization
         self.settings = load_and_validate_settings()
         
         layout = QVBoxLayout()
         self.enable_hotkey_cb = QCheckBox("Enable hotkey activation")
-        self.enable_hotkey_cb.setChecked(self.settings.value("enable_hotkey", True, bool))
+        self.enable_hotkey_cb.setChecked(read_setting("enable_hotkey"))
         layout.addWidget(self.enable_hotkey_cb)
         
         # Hotkey manager selection
@@ -95,7 +265,7 @@ class SettingsDialog(QDialog):
             self.hotkey_manager_combo.addItem(display_name, manager_key)
         
         # Set current selection
-        current_manager = self.settings.value("hotkey_manager", "auto", str)
+        current_manager = read_setting("hotkey_manager")
         current_index = self.hotkey_manager_combo.findData(current_manager)
         if current_index >= 0:
             self.hotkey_manager_combo.setCurrentIndex(current_index)
@@ -107,30 +277,42 @@ class SettingsDialog(QDialog):
         hotkey_layout.addWidget(QLabel("Hotkey:"))
         self.hotkey_edit = QKeySequenceEdit()
         self.hotkey_edit.setMaximumSequenceLength(1)
-        default_hotkey = self.settings.value("hotkey", "Ctrl+Q", str)
+        default_hotkey = read_setting("hotkey")
         self.hotkey_edit.setKeySequence(QKeySequence(default_hotkey))
         hotkey_layout.addWidget(self.hotkey_edit)
         layout.addLayout(hotkey_layout)
         
+        # Rapid re-recordings share one stop/restart of the global hotkey listener
+        self._hotkey_stopped = False
+        self._hotkey_restart_timer = QTimer(self)
+        self._hotkey_restart_timer.setSingleShot(True)
+        self._hotkey_restart_timer.setInterval(200)
+        self._hotkey_restart_timer.timeout.connect(self._restart_hotkey_after_edit)
         self.hotkey_edit.editingFinished.connect(self.on_hotkey_edit_finished)
         self.hotkey_edit.keySequenceChanged.connect(self.on_hotkey_recording_started)
         self.auto_paste_cb = QCheckBox("Enable auto paste after copying")
-        self.auto_paste_cb.setChecked(self.settings.value("auto_paste", True, bool))
+        self.auto_paste_cb.setChecked(read_setting("auto_paste"))
         layout.addWidget(self.auto_paste_cb)
         self.preserve_clipboard_cb = QCheckBox("Preserve original clipboard content")
-        self.preserve_clipboard_cb.setChecked(self.settings.value("preserve_clipboard", True, bool))
+        self.preserve_clipboard_cb.setChecked(read_setting("preserve_clipboard"))
         layout.addWidget(self.preserve_clipboard_cb)
         self.auto_paste_cb.toggled.connect(self.on_auto_paste_toggled)
         self.enable_hotkey_cb.toggled.connect(self.on_enable_hotkey_toggled)
-        self.on_enable_hotkey_toggled(self.enable_hotkey_cb.isChecked())
+        # Dependent widgets start in the right state instead of replaying the toggle handlers
+        hotkey_enabled = self.enable_hotkey_cb.isChecked()
+        self.hotkey_edit.setEnabled(hotkey_enabled)
+        self.hotkey_manager_combo.setEnabled(hotkey_enabled)
+        if not self.auto_paste_cb.isChecked():
+            self.preserve_clipboard_cb.setChecked(False)
+            self.preserve_clipboard_cb.setEnabled(False)
 
         log_level_layout = QHBoxLayout()
         log_level_layout.addWidget(QLabel("Log Level:"))
         self.log_level_combo = QComboBox()
-        self.log_level_combo.addItems(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
+        self.log_level_combo.addItems(_LOG_LEVELS)
         
-        current_log_level = self.settings.value("log_level", "WARNING", str)
-        current_index = self.log_level_combo.findText(current_log_level)
+        current_log_level = read_setting("log_level")
+        current_index = _LOG_LEVEL_INDEX.get(current_log_level, -1)
         if current_index >= 0:
             self.log_level_combo.setCurrentIndex(current_index)
         
@@ -139,8 +321,12 @@ class SettingsDialog(QDialog):
         layout.addLayout(log_level_layout)
 
         log_layout = QHBoxLayout()
-        log_size_label = QLabel(f"Log size: {get_log_file_size(log_file_path)}")
+        log_size_label = QLabel("Log size: ...")
         log_layout.addWidget(log_size_label)
+        self._log_size_label = log_size_label
+        log_size_query = QueryWorker(get_log_file_size, log_file_path)
+        log_size_query.signals.finished.connect(self._on_log_size_ready)
+        QThreadPool.globalInstance().start(log_size_query)
         clear_log_btn = QPushButton("Clear Log")
         clear_log_btn.clicked.connect(lambda: self.clear_log_file(log_size_label))
         log_layout.addWidget(clear_log_btn)
@@ -162,12 +348,18 @@ class SettingsDialog(QDialog):
 
         # Auto-startup checkbox (always visible, but disabled when not running under service)
         self.auto_startup_cb = QCheckBox("Enable auto-startup on boot")
-        self.auto_startup_cb.setChecked(self.is_service_enabled())
+        self.auto_startup_cb.setChecked(True)  # Default until the service probe answers
+        self.auto_startup_cb.setEnabled(False)
         
         # Enable/disable based on whether running under service
         if not is_running_under_service():
-            self.auto_startup_cb.setEnabled(False)
             self.auto_startup_cb.setToolTip("This option is only available when running as a system service")
+        else:
+            self.auto_startup_cb.setToolTip("Checking service status...")
+        
+        service_probe = QueryWorker(query_service_state)
+        service_probe.signals.finished.connect(self._on_service_probe_finished)
+        QThreadPool.globalInstance().start(service_probe)
         
         layout.addWidget(self.auto_startup_cb)
 
@@ -177,22 +369,45 @@ class SettingsDialog(QDialog):
         self.advanced_button.clicked.connect(self.toggle_advanced_settings)
         layout.addWidget(self.advanced_button)
         
-        # Advanced settings frame (initially hidden)
+        # Advanced settings frame, built on first expand (see _build_advanced_frame)
+        self.advanced_frame: QFrame | None = None
+        self._auto_file_link_cleared = False  # auto_paste was turned off before the section was built
+
+        button_layout = QHBoxLayout()
+        ok_btn = QPushButton("OK")
+        cancel_btn = QPushButton("Cancel")
+        ok_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addWidget(ok_btn)
+        button_layout.addWidget(cancel_btn)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        
+        self._fix_dialog_width()
+    
+    def _fix_dialog_width(self):
+        """Fix the dialog width so expanding or collapsing sections only changes its height."""
+        layout = self.layout()
+        if layout:
+            layout.activate()
+        self.adjustSize()
+        self.setFixedWidth(self.width())
+    
+    def _build_advanced_frame(self):
+        """Create the advanced settings section; most users never expand it, so it is built on demand."""
         self.advanced_frame = QFrame()
         self.advanced_frame.setFrameStyle(QFrame.Shape.Box)
-        self.advanced_frame.setVisible(False)
         
         advanced_layout = QVBoxLayout()
         
         # Auto file link checkbox (depends on auto paste)
         self.auto_file_link_cb = QCheckBox("Enable automatic file linking")
-        auto_file_link_enabled = self.settings.value("auto_file_link", False, bool)
-        auto_paste_enabled = self.settings.value("auto_paste", True, bool)
+        auto_file_link_enabled = read_setting("auto_file_link") and not self._auto_file_link_cleared
+        auto_paste_enabled = self.auto_paste_cb.isChecked()  # May have been toggled before expanding
         
         # Only enable auto file linking if auto paste is also enabled
         if auto_file_link_enabled and not auto_paste_enabled:
             auto_file_link_enabled = False
-            self.settings.setValue("auto_file_link", False)
         
         self.auto_file_link_cb.setChecked(auto_file_link_enabled)
         self.auto_file_link_cb.setEnabled(auto_paste_enabled)
@@ -208,11 +423,8 @@ class SettingsDialog(QDialog):
         target_dir_layout.addWidget(QLabel("Target directory:"))
         
         self.target_dir_button = QPushButton()
-        default_target_dir = self.settings.value("target_directory", ROOT, str)
-        # Ensure target directory exists, fallback to ROOT if not
-        if not os.path.exists(default_target_dir):
-            default_target_dir = ROOT
-            self.settings.setValue("target_directory", default_target_dir)
+        # Already checked to exist (or reset to ROOT) by load_and_validate_settings in __init__
+        default_target_dir = read_setting("target_directory")
         
         self.target_dir_button.setText(shorten_path(default_target_dir))
         self.target_dir_button.clicked.connect(self.select_target_directory)
@@ -221,7 +433,7 @@ class SettingsDialog(QDialog):
         
         # Use symlink checkbox
         self.use_symlink_cb = QCheckBox("Use symbolic links instead of hard links")
-        self.use_symlink_cb.setChecked(self.settings.value("use_symlink", False, bool))
+        self.use_symlink_cb.setChecked(read_setting("use_symlink"))
         advanced_layout.addWidget(self.use_symlink_cb)
         
         # Clean up links button
@@ -241,11 +453,10 @@ class SettingsDialog(QDialog):
         active_dismissal_layout = QHBoxLayout()
         active_dismissal_layout.addWidget(QLabel("When pressing Esc:"))
         self.active_dismissal_combo = QComboBox()
-        self.active_dismissal_combo.addItem("Save content and cursor position", "content_and_cursor")
-        self.active_dismissal_combo.addItem("Save content only", "content_only")
-        self.active_dismissal_combo.addItem("Don't save anything", "no_save")
+        for text, behavior in _DISMISSAL_CHOICES:
+            self.active_dismissal_combo.addItem(text, behavior)
         
-        current_active_setting = self.settings.value("active_dismissal_behavior", "content_and_cursor", str)
+        current_active_setting = read_setting("active_dismissal_behavior")
         active_index = self.active_dismissal_combo.findData(current_active_setting)
         if active_index >= 0:
             self.active_dismissal_combo.setCurrentIndex(active_index)
@@ -258,11 +469,10 @@ class SettingsDialog(QDialog):
         passive_dismissal_layout.addWidget(QLabel("When losing focus:"))
         self.passive_dismissal_combo = QComboBox()
         self.passive_dismissal_combo.addItem("Follow Esc behavior", "follow_active")
-        self.passive_dismissal_combo.addItem("Save content and cursor position", "content_and_cursor")
-        self.passive_dismissal_combo.addItem("Save content only", "content_only")
-        self.passive_dismissal_combo.addItem("Don't save anything", "no_save")
+        for text, behavior in _DISMISSAL_CHOICES:
+            self.passive_dismissal_combo.addItem(text, behavior)
         
-        current_passive_setting = self.settings.value("passive_dismissal_behavior", "follow_active", str)
+        current_passive_setting = read_setting("passive_dismissal_behavior")
         passive_index = self.passive_dismissal_combo.findData(current_passive_setting)
         if passive_index >= 0:
             self.passive_dismissal_combo.setCurrentIndex(passive_index)
@@ -271,41 +481,42 @@ class SettingsDialog(QDialog):
         advanced_layout.addLayout(passive_dismissal_layout)
         
         self.advanced_frame.setLayout(advanced_layout)
-        layout.addWidget(self.advanced_frame)
+        layout = self.layout()
+        layout.insertWidget(layout.indexOf(self.advanced_button) + 1, self.advanced_frame)
         
         # Initialize the state of advanced controls
         self.on_auto_file_link_toggled(self.auto_file_link_cb.isChecked())
-        # Initialize auto paste state after all UI elements are created
-        self.on_auto_paste_toggled(self.auto_paste_cb.isChecked())
-
-        button_layout = QHBoxLayout()
-        ok_btn = QPushButton("OK")
-        cancel_btn = QPushButton("Cancel")
-        ok_btn.clicked.connect(self.accept)
-        cancel_btn.clicked.connect(self.reject)
-        button_layout.addWidget(ok_btn)
-        button_layout.addWidget(cancel_btn)
-        layout.addLayout(button_layout)
-        self.setLayout(layout)
         
-        self._fix_dialog_width()
+        # Widen the dialog once if the advanced section needs more room than the basic one
+        layout.activate()
+        self.setFixedWidth(max(self.width(), layout.sizeHint().width()))
     
-    def _fix_dialog_width(self):
-        """Calculate and fix the dialog width based on the expanded advanced settings."""
-        was_visible = self.advanced_frame.isVisible()
-        self.advanced_frame.setVisible(True)
-        layout = self.layout()
-        if layout:
-            layout.activate()
-        self.adjustSize()
-        max_width = self.width()
-        self.advanced_frame.setVisible(was_visible)
-        self.setFixedWidth(max_width)
-        if not was_visible:
-            self.adjustSize()
+    def _advanced_settings(self) -> dict:
+        """Values of the advanced section, taken from the stored settings if it was never expanded."""
+        if self.advanced_frame is None:
+            return {
+                "auto_file_link": (self.auto_paste_cb.isChecked() and not self._auto_file_link_cleared
+                                   and read_setting("auto_file_link")),
+                "target_directory": read_setting("target_directory"),
+                "use_symlink": read_setting("use_symlink"),
+                "active_dismissal_behavior": read_setting("active_dismissal_behavior"),
+                "passive_dismissal_behavior": read_setting("passive_dismissal_behavior")
+            }
+        return {
+            "auto_file_link": self.auto_file_link_cb.isChecked(),
+            "target_directory": expand_path(self.target_dir_button.text()),
+            "use_symlink": self.use_symlink_cb.isChecked(),
+            "active_dismissal_behavior": self.active_dismissal_combo.currentData(),
+            "passive_dismissal_behavior": self.passive_dismissal_combo.currentData()
+        }
     
     def on_auto_paste_toggled(self, checked):
         self.preserve_clipboard_cb.setEnabled(checked)
+        if self.advanced_frame is None:
+            self.preserve_clipboard_cb.setChecked(checked)
+            if not checked:
+                self._auto_file_link_cleared = True  # The built checkbox would have been unchecked too
+            return  # _build_advanced_frame reads auto_paste_cb when the section is created
         if not checked:
             self.preserve_clipboard_cb.setChecked(False)
             self.auto_file_link_cb.setChecked(False)
@@ -324,6 +535,9 @@ class SettingsDialog(QDialog):
     
     def toggle_advanced_settings(self):
         """Toggle the visibility of advanced settings."""
+        if self.advanced_frame is None:
+            self._build_advanced_frame()
+            self.advanced_frame.setVisible(False)
         is_visible = self.advanced_frame.isVisible()
         self.advanced_frame.setVisible(not is_visible)
         self.advanced_button.setText("Advanced Settings" if is_visible else "Hide Advanced Settings")
@@ -353,9 +567,12 @@ class SettingsDialog(QDialog):
     
     def cleanup_created_links(self):
         """Open the link cleanup dialog."""
-        from .input import InputDialog
-        temp_dialog = InputDialog()
-        temp_dialog.cleanup_created_links()
+        # Prefer the app's dialog so its in-memory link cache stays authoritative
+        input_dialog = getattr(self.parent_app, 'input_dialog', None)
+        if input_dialog is None:
+            from .input import InputDialog
+            input_dialog = InputDialog()
+        input_dialog.cleanup_created_links()
 
     def on_log_level_changed(self, level_name):
         """Handle log level change."""
@@ -374,7 +591,7 @@ class SettingsDialog(QDialog):
         
         if reply == QMessageBox.StandardButton.Yes:
             if clear_log_file(log_file_path):
-                log_size_label.setText(f"Log size: {get_log_file_size(log_file_path)}")
+                log_size_label.setText("Log size: 0.0 B")  # Just truncated, no need to stat it again
                 logger.info("Log file cleared by user")
             else:
                 QMessageBox.warning(self, "Error", "Failed to clear log file.")
@@ -384,35 +601,10 @@ class SettingsDialog(QDialog):
         try:
             main_py_path = os.path.join(ROOT, "main.py")
 
-            conda_env = os.environ.get('CONDA_DEFAULT_ENV')
-            conda_prefix = os.environ.get('CONDA_PREFIX')
-            conda_exe = os.environ.get('CONDA_EXE')
-            
-            if not conda_env or not conda_prefix or not conda_exe:
-                python_executable = sys.executable
-                if 'conda' in python_executable or 'anaconda' in python_executable:
-                    import re
-                    env_match = re.search(r'envs/([^/]+)/', python_executable)
-                    if env_match:
-                        conda_env = env_match.group(1)
-                        conda_base_match = re.search(r'(.+?)/envs/', python_executable)
-                        if conda_base_match:
-                            conda_base = conda_base_match.group(1)
-                            conda_exe = os.path.join(conda_base, 'bin', 'conda')
-                            if not os.path.exists(conda_exe):
-                                conda_exe = os.path.join(conda_base, 'condabin', 'conda')
-                    else:
-                        base_match = re.search(r'(.+?)/bin/python', python_executable)
-                        if base_match:
-                            conda_base = base_match.group(1)
-                            conda_exe = os.path.join(conda_base, 'bin', 'conda')
-                            if not os.path.exists(conda_exe):
-                                conda_exe = os.path.join(conda_base, 'condabin', 'conda')
-                            conda_env = 'base'
+            conda_env, conda_exe = detect_conda_env()
             
             if not conda_env or not conda_exe or not os.path.exists(conda_exe):
-                QMessageBox.critical(
-                    self,
+                self._show_error(
                     "Conda Environment Required",
                     "Conda environment not detected.\n\n"
                     "Please ensure:\n"
@@ -434,31 +626,19 @@ class SettingsDialog(QDialog):
             session_type = os.environ.get("XDG_SESSION_TYPE", "x11")
             wayland_display = os.environ.get("WAYLAND_DISPLAY", "")
 
-            service_content = f"""[Unit]
-Description=Input Box - Quick Input Tool
-After=graphical-session.target
-Wants=graphical-session.target
-PartOf=graphical-session.target
-
-[Service]
-Type=simple
-Environment="DISPLAY={display}"
-Environment="XDG_RUNTIME_DIR=/run/user/{user_id}"
-Environment="HOME={os.path.expanduser('~')}"
-Environment="XDG_SESSION_TYPE={session_type}"
-Environment="WAYLAND_DISPLAY={wayland_display}"
-Environment="PATH={os.environ.get('PATH', '')}"
-ExecStart={exec_command}
-Restart=on-failure
-RestartSec=5
-WorkingDirectory={ROOT}
-
-[Install]
-WantedBy=graphical-session.target
-"""
+            service_content = _SERVICE_TEMPLATE.format(
+                display=display,
+                user_id=user_id,
+                home=os.path.expanduser('~'),
+                session_type=session_type,
+                wayland_display=wayland_display,
+                path=os.environ.get('PATH', ''),
+                exec_command=exec_command,
+                root=ROOT,
+            )
             
-            user_systemd_dir = os.path.expanduser("~/.config/systemd/user")
-            target_path = os.path.join(user_systemd_dir, "input-box.service")
+            user_systemd_dir = os.path.dirname(_UNIT_PATH)
+            target_path = _UNIT_PATH
             
             if os.path.exists(target_path):
                 reply = QMessageBox.question(
@@ -472,13 +652,18 @@ WantedBy=graphical-session.target
                     logger.info("User chose not to overwrite existing service file.")
                     return
                 try:
-                    subprocess.run(['systemctl', '--user', 'stop', 'input-box.service'], check=True)
+                    _systemctl(_CMD_STOP)
                 except subprocess.CalledProcessError as e:
                     logger.warning(f"Failed to stop existing service: {e}")
             
             os.makedirs(user_systemd_dir, exist_ok=True)
-            with open(target_path, 'w', encoding='utf-8') as f:
+            # Write beside the unit and rename so systemd never sees a half-written file
+            tmp_path = f"{target_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 f.write(service_content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target_path)
             logger.info(f"Service file created at: {target_path}")
             logger.info(f"Using conda environment '{conda_env}' with command: {exec_command}")
             
@@ -499,8 +684,7 @@ WantedBy=graphical-session.target
             if service_started:
                 self.__my_parent.quit_app()
         except Exception as e:
-            QMessageBox.critical(
-                self,
+            self._show_error(
                 "Error",
                 f"Failed to register service:\n{str(e)}"
             )
@@ -509,7 +693,7 @@ WantedBy=graphical-session.target
     def restart_service(self):
         """Restart the systemd user service."""
         try:
-            subprocess.run(['systemctl', '--user', 'restart', 'input-box.service'], check=True)
+            _systemctl(_CMD_RESTART)
             QMessageBox.information(
                 self,
                 "Service Restarted",
@@ -517,8 +701,7 @@ WantedBy=graphical-session.target
             )
             logger.info("Service restarted successfully")
         except subprocess.CalledProcessError as e:
-            QMessageBox.critical(
-                self,
+            self._show_error(
                 "Restart Failed",
                 f"Failed to restart the service:\n{str(e)}\n\n"
                 "Please check if the service is properly installed:\n"
@@ -526,62 +709,73 @@ WantedBy=graphical-session.target
             )
             logger.error(f"Failed to restart service: {e}")
         except Exception as e:
-            QMessageBox.critical(
-                self,
+            self._show_error(
                 "Error",
                 f"An error occurred while restarting the service:\n{str(e)}"
             )
             logger.error(f"Error restarting service: {e}")
     
+    def _show_error(self, title: str, text: str):
+        """Show a critical message box, reusing one instance for every error of this dialog."""
+        if self._error_box is None:
+            self._error_box = QMessageBox(self)
+            self._error_box.setIcon(QMessageBox.Icon.Critical)
+            self._error_box.setStandardButtons(QMessageBox.StandardButton.Ok)
+        self._error_box.setWindowTitle(title)
+        self._error_box.setText(text)
+        self._error_box.exec()
+    
+    def _get_service_state(self) -> dict[str, str]:
+        """Return the service's systemctl state, querying it here if the background probe has not answered yet."""
+        if self._service_state is None:
+            self._service_state = query_service_state()
+        return self._service_state
+    
+    @pyqtSlot(object)
+    def _on_log_size_ready(self, size_text):
+        if self._log_size_label.text() == "Log size: ...":  # Not already reset by clear_log_file
+            self._log_size_label.setText(f"Log size: {size_text}")
+    
+    @pyqtSlot(object)
+    def _on_service_probe_finished(self, state):
+        self._service_probe_pending = False
+        if self._service_state is None:
+            self._service_state = state
+        self.auto_startup_cb.setChecked(self.is_service_enabled())
+        if is_running_under_service():
+            self.auto_startup_cb.setEnabled(True)
+            self.auto_startup_cb.setToolTip("")
+    
+    def _invalidate_service_state(self):
+        """Forget the cached service state after enabling, disabling or registering the service."""
+        self._service_state = None
+    
     def is_service_enabled(self) -> bool:
         """Check if the input-box service is enabled for auto-startup."""
-        try:
-            # First check if the service exists
-            result = subprocess.run(
-                ['systemctl', '--user', 'list-unit-files', 'input-box.service'],
-                capture_output=True,
-                text=True
-            )
-            
-            # If service doesn't exist, return True as default
-            if result.returncode != 0 or 'input-box.service' not in result.stdout:
-                logger.debug("Service does not exist, returning default value True")
-                return True
-            
-            # If service exists, check if it's enabled
-            result = subprocess.run(
-                ['systemctl', '--user', 'is-enabled', 'input-box.service'],
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0 and result.stdout.strip() == 'enabled'
-        except Exception as e:
-            logger.warning(f"Failed to check service enabled status: {e}")
-            return True  # Default
+        # If service doesn't exist, return True as default
+        if not self.service_exists():
+            logger.debug("Service does not exist, returning default value True")
+            return True
+        return self._get_service_state().get('UnitFileState') == 'enabled'
     
     def service_exists(self) -> bool:
         """Check if the input-box service exists."""
-        try:
-            result = subprocess.run(
-                ['systemctl', '--user', 'list-unit-files', 'input-box.service'],
-                capture_output=True,
-                text=True
-            )
-            return result.returncode == 0 and 'input-box.service' in result.stdout
-        except Exception as e:
-            logger.warning(f"Failed to check service existence: {e}")
-            return False
+        return self._get_service_state().get('LoadState', 'not-found') != 'not-found'
     
     def _reload_user_systemd_and_enable_service(self) -> bool:
         """Reload user systemd and enable service."""
+        self._invalidate_service_state()
         try:
-            subprocess.run(['systemctl', '--user', 'daemon-reload'], check=True)
-            subprocess.run(['systemctl', '--user', 'enable', 'input-box.service'], check=True)
+            _systemctl(_CMD_DAEMON_RELOAD)
             try:
-                subprocess.run(['systemctl', '--user', 'start', 'input-box.service'], check=True)
+                # enable --now enables and starts in one call
+                _systemctl(_CMD_ENABLE_NOW)
                 logger.info("User systemd reloaded, service enabled and started")
                 return True
             except subprocess.CalledProcessError as e:
+                # Only then tell "enabled but not started" apart from a failed enable
+                if query_service_state().get('UnitFileState') != 'enabled':
+                    raise
                 logger.warning(f"Service enabled but failed to start: {e}")
                 logger.info("User systemd reloaded and service enabled")
                 return False
@@ -593,13 +787,16 @@ WantedBy=graphical-session.target
     def _reload_systemd_and_enable_service(self) -> bool:
         """Reload systemd and enable service (when running as root)."""
         try:
-            subprocess.run(['systemctl', 'daemon-reload'], check=True)
-            subprocess.run(['systemctl', 'enable', 'input-box.service'], check=True)
+            _systemctl(['systemctl', 'daemon-reload'])
             try:
-                subprocess.run(['systemctl', 'start', 'input-box.service'], check=True)
+                _systemctl(['systemctl', 'enable', '--now', 'input-box.service'])
                 logger.info("Systemd reloaded, service enabled and started")
                 return True
             except subprocess.CalledProcessError as e:
+                result = _systemctl(['systemctl', 'is-enabled', 'input-box.service'],
+                                    check=False, capture_output=True, text=True)
+                if result.stdout.strip() != 'enabled':
+                    raise
                 logger.warning(f"Service enabled but failed to start: {e}")
                 logger.info("Systemd reloaded and service enabled")
                 return False
@@ -608,14 +805,27 @@ WantedBy=graphical-session.target
             raise RuntimeError(f"Failed to reload user systemd or enable service: {e}")
     
     def on_hotkey_recording_started(self):
+        self._hotkey_restart_timer.stop()
+        if self._hotkey_stopped:
+            return
         if self.parent_app and hasattr(self.parent_app, 'stop_hotkey_temporarily'):
             self.parent_app.stop_hotkey_temporarily()
+            self._hotkey_stopped = True
     
     def on_hotkey_edit_finished(self):
+        self._hotkey_restart_timer.start()
+    
+    def _restart_hotkey_after_edit(self):
+        if not self._hotkey_stopped:
+            return
+        self._hotkey_stopped = False
         if self.parent_app and hasattr(self.parent_app, 'restart_hotkey_temporarily'):
             self.parent_app.restart_hotkey_temporarily()
     
     def accept(self):
+        if self._service_probe_pending:
+            # OK was clicked before the probe answered: replace the placeholder with the real state
+            self._on_service_probe_finished(self._get_service_state())
         settings_dict = {
             "enable_hotkey": self.enable_hotkey_cb.isChecked(),
             "hotkey": self.hotkey_edit.keySequence().toString(),
@@ -623,11 +833,7 @@ WantedBy=graphical-session.target
             "auto_paste": self.auto_paste_cb.isChecked(),
             "preserve_clipboard": self.preserve_clipboard_cb.isChecked(),
             "log_level": self.log_level_combo.currentText(),
-            "auto_file_link": self.auto_file_link_cb.isChecked(),
-            "target_directory": expand_path(self.target_dir_button.text()),
-            "use_symlink": self.use_symlink_cb.isChecked(),
-            "active_dismissal_behavior": self.active_dismissal_combo.currentData(),
-            "passive_dismissal_behavior": self.passive_dismissal_combo.currentData()
+            **self._advanced_settings()
         }
         
         # Handle auto-startup setting change (only when running under service and service exists)
@@ -638,19 +844,19 @@ WantedBy=graphical-session.target
                 new_setting = self.auto_startup_cb.isChecked()
                 
                 if current_enabled != new_setting:
+                    self._invalidate_service_state()
                     try:
                         if new_setting:
-                            subprocess.run(['systemctl', '--user', 'enable', 'input-box.service'], check=True)
+                            _systemctl(_CMD_ENABLE)
                             logger.info("Auto-startup enabled for input-box service")
                         else:
-                            subprocess.run(['systemctl', '--user', 'disable', 'input-box.service'], check=True)
+                            _systemctl(_CMD_DISABLE)
                             logger.info("Auto-startup disabled for input-box service")
                         settings_dict["auto_startup"] = new_setting
                         
                     except subprocess.CalledProcessError as e:
                         logger.error(f"Failed to {'enable' if new_setting else 'disable'} auto-startup: {e}")
-                        QMessageBox.critical(
-                            self,
+                        self._show_error(
                             "Error",
                             f"Failed to {'enable' if new_setting else 'disable'} auto-startup:\n{str(e)}\n\n"
                             "Settings will not be saved."
@@ -658,8 +864,7 @@ WantedBy=graphical-session.target
                         return
                     except Exception as e:
                         logger.error(f"Error handling auto-startup setting: {e}")
-                        QMessageBox.critical(
-                            self,
+                        self._show_error(
                             "Error",
                             f"An error occurred while changing auto-startup setting:\n{str(e)}\n\n"
                             "Settings will not be saved."
@@ -675,12 +880,14 @@ WantedBy=graphical-session.target
             # Not running under service, just save the setting
             settings_dict["auto_startup"] = self.auto_startup_cb.isChecked()
         
-        save_settings_to_file(settings_dict)
+        save_settings_to_file(settings_dict, defer_sync=True)
         
         logger.info("Settings saved successfully")
+        self._hotkey_restart_timer.stop()  # The app restarts the hotkey itself after accepting
         super().accept()
     
     def reject(self):
+        self._hotkey_restart_timer.stop()
         # Restart hotkey listener if dialog is cancelled
         if self.parent_app and hasattr(self.parent_app, 'restart_hotkey_temporarily'):
             self.parent_app.restart_hotkey_temporarily()
@@ -695,11 +902,7 @@ WantedBy=graphical-session.target
             'preserve_clipboard': self.preserve_clipboard_cb.isChecked(),
             'log_level': self.log_level_combo.currentText(),
             'auto_startup': self.auto_startup_cb.isChecked(),
-            'auto_file_link': self.auto_file_link_cb.isChecked(),
-            'target_directory': expand_path(self.target_dir_button.text()),
-            'use_symlink': self.use_symlink_cb.isChecked(),
-            'active_dismissal_behavior': self.active_dismissal_combo.currentData(),
-            'passive_dismissal_behavior': self.passive_dismissal_combo.currentData()
+            **self._advanced_settings()
         }
         
         return settings
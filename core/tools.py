@@ -1,6 +1,9 @@
 import os
 import logging
 import inspect
+import functools
+from urllib.parse import urlsplit, unquote
+from PyQt6.QtCore import QSettings
 from .logger_config import *
 
 __frame = inspect.currentframe()
@@ -15,6 +18,41 @@ log_file_path = os.path.join(ROOT, "input-box.log")
 setup_logging(log_file_path, logging.WARNING)
 logger = get_logger(__name__)
 
+CONFIG_PATH = os.path.join(ROOT, "input-box.config")
+_settings: QSettings | None = None
+_settings_cache: dict[tuple, object] = {}  # (key, type, default) -> value read through get_setting
+
+
+def get_settings_store() -> QSettings:
+    """Return the process-wide QSettings for the config file, created on first use."""
+    global _settings
+    if _settings is None:
+        _settings = QSettings(CONFIG_PATH, QSettings.Format.IniFormat)
+    return _settings
+
+
+def get_setting(key: str, default, type_: type):
+    """Read a setting through an in-memory cache; default must be hashable."""
+    cache_key = (key, type_, default)
+    try:
+        return _settings_cache[cache_key]
+    except KeyError:
+        value = _settings_cache[cache_key] = get_settings_store().value(key, default, type_)
+        return value
+
+
+def reload_settings():
+    """Drop cached setting reads and pick up changes made to the config file by other processes."""
+    _settings_cache.clear()
+    get_settings_store().sync()
+
+
+def set_setting(key: str, value):
+    """Write a setting and drop its cached values; call get_settings_store().sync() to flush."""
+    get_settings_store().setValue(key, value)
+    for cache_key in [cache_key for cache_key in _settings_cache if cache_key[0] == key]:
+        del _settings_cache[cache_key]
+
 
 def shorten_path(path: str) -> str:
     """Replace home directory in path with ~ for shorter display."""
@@ -32,8 +70,22 @@ def expand_path(path: str) -> str:
     return os.path.expanduser(path)
 
 
+def file_url_to_path(url: str) -> str | None:
+    """Convert a local file:// URL to a filesystem path, or None if it is not one."""
+    if not url.startswith('file://'):
+        return None
+    parts = urlsplit(url)
+    if parts.netloc not in ('', 'localhost'):
+        return None
+    return unquote(parts.path)
+
+
+@functools.lru_cache(maxsize=None)
 def is_running_under_service() -> bool:
-    """Check if the current process is running under systemd service."""
+    """Check if the current process is running under systemd service.
+    
+    The answer depends only on the process's ancestry, so it is computed once per process.
+    """
     try:
         # Check if parent process is systemd
         try:
@@ -43,22 +95,24 @@ def is_running_under_service() -> bool:
             psutil = None
         if psutil:
             try:
-                current_process = psutil.Process()
-                parent = current_process.parent()
-                tree = [current_process.name()]
-                while parent:
-                    tree.append(parent.name())
-                    parent = parent.parent()
-                if not "conda" in tree:
-                    return False
-                idx = tree.index("conda")
-                if tree[idx + 1] == "systemd":
-                    logger.debug("Detected running under systemd (parent process check)")
-                    return True
+                # Only the ancestor right above the nearest conda matters: stop there instead of walking to init
+                after_conda = False
+                process = psutil.Process()
+                while process:
+                    # oneshot: name() and parent()'s ppid come from a single /proc/<pid>/stat read
+                    with process.oneshot():
+                        name = process.name()
+                        if after_conda:
+                            if name == "systemd":
+                                logger.debug("Detected running under systemd (parent process check)")
+                                return True
+                            return False
+                        after_conda = name == "conda"
+                        process = process.parent()
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 pass
             except Exception as e:
-                logger.debug(f"Error in parent process check: {e}")
+                logger.debug("Error in parent process check: %s", e)
         
         logger.debug("Not running under systemd service")
         return False
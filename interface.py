@@ -34,7 +34,7 @@ class CallbackPosition(Enum):
     ON_FOCUS_LOST = "on_focus_lost"  # Input box lost focus
 
 
-@dataclass
+@dataclass(slots=True)
 class CallbackContext:
     """
     Context information passed to callbacks.
@@ -48,7 +48,7 @@ class CallbackContext:
             self.data = {}
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginMetadata:
     """
     Metadata for a plugin.
@@ -69,6 +69,8 @@ class Callback(metaclass=ABCMeta):
     Abstract base class for all callbacks.
     """
 
+    __slots__ = ()  # Lets subclasses that declare __slots__ drop their __dict__
+
     @property
     @abstractmethod
     def position(self) -> CallbackPosition:
@@ -105,7 +107,7 @@ class Callback(metaclass=ABCMeta):
         return True
 
 
-@dataclass
+@dataclass(slots=True)
 class PluginSettings:
     """
     Plugin settings configuration.
@@ -1,15 +1,55 @@
+import os
 import sys
+import json
+import bisect
+import operator
+import types
 import importlib
 import importlib.util
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from interface import Plugin, Callback, CallbackPosition, CallbackContext
+from interface import Plugin, Callback, CallbackPosition, CallbackContext, PluginMetadata
 
 if TYPE_CHECKING:
     from core.logger_config import EnhancedLogger
 
 
+_callback_priority = operator.attrgetter('priority')  # Sort key for the position lists
+
+
+def _base_name(directory_name: str) -> str:
+    """Plugin name for a directory, with any '.disabled' suffix stripped."""
+    return directory_name.removesuffix('.disabled')
+
+
+_MODULE_PREFIX = "_inputbox_plugins"  # Private namespace: a plugin directory can never shadow plugins.plugin_manager
+
+
+def _forget_plugin_modules(module_name: str) -> None:
+    """Drop a plugin's package and all of its submodules from sys.modules."""
+    prefix = module_name + '.'
+    for name in [name for name in sys.modules if name == module_name or name.startswith(prefix)]:
+        del sys.modules[name]
+
+
+class _DisabledPluginStub(Plugin):
+    """
+    Stand-in for a disabled plugin, described by its plugin.json instead of importing it.
+    """
+    
+    def __init__(self, metadata: PluginMetadata):
+        self._metadata = metadata
+    
+    @property
+    def metadata(self) -> PluginMetadata:
+        return self._metadata
+    
+    @property
+    def callbacks(self) -> list[Callback]:
+        return []
+
+
 class PluginManager:
     """
     Manages loading, initialization, and execution of plugins.
@@ -19,6 +59,7 @@ class PluginManager:
         self.plugins_dir = Path(plugins_dir)
         self.logger = logger
         self.plugins: list[Plugin] = []
+        self._plugins_by_name: dict[str, Plugin] = {}  # metadata.name -> first plugin loaded with it
         self.callbacks: dict[CallbackPosition, list[Callback]] = {
             position: [] for position in CallbackPosition
         }
@@ -34,114 +75,207 @@ class PluginManager:
             self.logger.warning(f"Plugins directory {self.plugins_dir} does not exist")
             return
         self.plugins.clear()
+        self._plugins_by_name.clear()
         for position in CallbackPosition:
             self.callbacks[position].clear()
-        plugin_dirs = [d for d in self.plugins_dir.iterdir() 
-                      if d.is_dir() and not d.name.startswith('__')]
+        with os.scandir(self.plugins_dir) as entries:
+            dir_names = [entry.name for entry in entries
+                         if entry.is_dir() and not entry.name.startswith('__')]
         
-        current_directories = {d.name for d in plugin_dirs}
+        current_directories = set(dir_names)
         if self._last_known_directories:
             new_plugins = current_directories - self._last_known_directories
-            for new_plugin_name in new_plugins:
-                if not new_plugin_name.endswith('.disabled'):
-                    old_path = self.plugins_dir / new_plugin_name
-                    new_path = self.plugins_dir / f"{new_plugin_name}.disabled"
+            for index, dir_name in enumerate(dir_names):
+                if dir_name in new_plugins and not dir_name.endswith('.disabled'):
+                    old_path = self.plugins_dir / dir_name
+                    new_path = self.plugins_dir / f"{dir_name}.disabled"
                     try:
                         old_path.rename(new_path)
-                        self.logger.info(f"Auto-disabled new plugin: {new_plugin_name}")
+                        dir_names[index] = new_path.name
+                        self.logger.info(f"Auto-disabled new plugin: {dir_name}")
                     except Exception as e:
-                        self.logger.error(f"Failed to auto-disable new plugin {new_plugin_name}: {e}")
+                        self.logger.error(f"Failed to auto-disable new plugin {dir_name}: {e}")
         
-        self._last_known_directories = current_directories.copy()
-        plugin_dirs = [d for d in self.plugins_dir.iterdir() 
-                      if d.is_dir() and not d.name.startswith('__')]
-        for plugin_dir in plugin_dirs:
-            self._load_plugin(plugin_dir)
+        self._last_known_directories = current_directories
+        for dir_name in dir_names:
+            self._load_plugin(self.plugins_dir / dir_name)
         
         for position in CallbackPosition:
-            self.callbacks[position].sort(key=lambda cb: cb.priority)
+            self.callbacks[position].sort(key=_callback_priority)
         self.logger.info(f"Loaded {len(self.plugins)} plugins")
     
     def _load_plugin(self, plugin_dir: Path) -> None:
         """
         Load a single plugin from a directory.
+        
+        Disabled plugins that ship a plugin.json manifest are not imported; a stub
+        built from the manifest stands in for them until they are enabled.
         """
         plugin_name = plugin_dir.name
         
         is_disabled = plugin_name.endswith('.disabled')
-        if is_disabled:
-            actual_name = plugin_name[:-9]
+        actual_name = _base_name(plugin_name)
+        
+        try:
+            plugin_instance = None
+            if is_disabled:
+                metadata = self._read_manifest(plugin_dir, actual_name)
+                if metadata is not None:
+                    plugin_instance = _DisabledPluginStub(metadata)
+            if plugin_instance is None:
+                plugin_instance = self._import_plugin(plugin_dir, actual_name)
+                if plugin_instance is None:
+                    return
+            
+            self._tag_plugin(plugin_instance, plugin_dir, actual_name)
+            
+            self.plugins.append(plugin_instance)
+            self._plugins_by_name.setdefault(plugin_instance.metadata.name, plugin_instance)
+            if not is_disabled:
+                for callback in self._plugin_callbacks(plugin_instance):
+                    if callback.enabled:
+                        self.callbacks[callback.position].append(callback)
+            status = "disabled" if is_disabled else "enabled"
+            self.logger.info(f"Successfully loaded plugin: {plugin_instance.metadata.name} ({status})")
+                    
+        except Exception as e:
+            self.logger.error(f"Failed to load plugin {actual_name}: {e}")
+    
+    def _read_manifest(self, plugin_dir: Path, actual_name: str) -> PluginMetadata | None:
+        """
+        Read a plugin's metadata from its plugin.json, or return None if it has none.
+        """
+        manifest_file = plugin_dir / "plugin.json"
+        if not manifest_file.is_file():
+            return None
+        try:
+            with open(manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            return PluginMetadata(
+                name=manifest['name'],
+                version=str(manifest.get('version', '')),
+                description=manifest.get('description', ''),
+                author=manifest.get('author', ''),
+                dependencies=manifest.get('dependencies')
+            )
+        except Exception as e:
+            self.logger.warning(f"Ignoring invalid plugin.json for {actual_name}: {e}")
+            return None
+    
+    def _import_plugin(self, plugin_dir: Path, actual_name: str) -> Plugin | None:
+        """
+        Execute a plugin's module and return its Plugin instance.
+        """
+        init_file = plugin_dir / "__init__.py"
+        main_file = plugin_dir / "main.py"
+        
+        if init_file.exists():
+            module_file = init_file
+        elif main_file.exists():
+            module_file = main_file
         else:
-            actual_name = plugin_name
+            self.logger.warning(f"No entry point found for plugin {actual_name}")
+            return None
+        
+        # Load the plugin as a package so `from . import x` resolves inside its directory
+        spec = importlib.util.spec_from_file_location(
+            f"{_MODULE_PREFIX}.{actual_name}", 
+            module_file,
+            submodule_search_locations=[str(plugin_dir)]
+        )
+        if spec is None or spec.loader is None:
+            self.logger.error(f"Failed to create module spec for plugin {actual_name}")
+            return None
+        
+        if _MODULE_PREFIX not in sys.modules:
+            # Empty parent package, so the plugins' relative imports can resolve
+            namespace = types.ModuleType(_MODULE_PREFIX)
+            namespace.__path__ = []
+            sys.modules[_MODULE_PREFIX] = namespace
+        module = importlib.util.module_from_spec(spec)
+        _forget_plugin_modules(spec.name)  # Submodules cached by an earlier load would be stale
+        sys.modules[spec.name] = module
+        # Plugins written before package loading import their siblings as top-level modules
+        path_added = str(plugin_dir) not in sys.path
+        if path_added:
+            sys.path.insert(0, str(plugin_dir))
         
         try:
-            init_file = plugin_dir / "__init__.py"
-            main_file = plugin_dir / "main.py"
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                _forget_plugin_modules(spec.name)
+                raise
             
-            if init_file.exists():
-                module_file = init_file
-            elif main_file.exists():
-                module_file = main_file
+            plugin_instance = None
+            if hasattr(module, 'create_plugin'):
+                plugin_instance = module.create_plugin()
+            elif hasattr(module, 'plugin'):
+                plugin_instance = module.plugin
+            elif hasattr(module, '__plugin__'):
+                # Preferred declaration: a Plugin subclass or instance, no module scan needed
+                entry = module.__plugin__
+                plugin_instance = entry() if isinstance(entry, type) else entry
             else:
-                self.logger.warning(f"No entry point found for plugin {actual_name}")
-                return
+                # Legacy plugins without a declared entry point: scan the module
+                for attr_name in dir(module):
+                    attr = getattr(module, attr_name)
+                    if (isinstance(attr, type) and 
+                        issubclass(attr, Plugin) and 
+                        attr is not Plugin):
+                        plugin_instance = attr()
+                        break
             
-            spec = importlib.util.spec_from_file_location(
-                f"plugins.{actual_name}", 
-                module_file
-            )
-            if spec is None or spec.loader is None:
-                self.logger.error(f"Failed to create module spec for plugin {actual_name}")
-                return
+            if plugin_instance is None:
+                self.logger.error(f"No Plugin instance found in {actual_name}")
+                _forget_plugin_modules(spec.name)
+                return None
             
-            module = importlib.util.module_from_spec(spec)
-            if str(plugin_dir) not in sys.path:
-                sys.path.insert(0, str(plugin_dir))
+            if not isinstance(plugin_instance, Plugin):
+                self.logger.error(f"Invalid plugin type in {actual_name}")
+                _forget_plugin_modules(spec.name)
+                return None
             
-            try:
-                spec.loader.exec_module(module)
-                
-                plugin_instance = None
-                if hasattr(module, 'create_plugin'):
-                    plugin_instance = module.create_plugin()
-                elif hasattr(module, 'plugin'):
-                    plugin_instance = module.plugin
-                else:
-                    for attr_name in dir(module):
-                        attr = getattr(module, attr_name)
-                        if (isinstance(attr, type) and 
-                            issubclass(attr, Plugin) and 
-                            attr is not Plugin):
-                            plugin_instance = attr()
-                            break
-                
-                if plugin_instance is None:
-                    self.logger.error(f"No Plugin instance found in {actual_name}")
-                    return
-                
-                if not isinstance(plugin_instance, Plugin):
-                    self.logger.error(f"Invalid plugin type in {actual_name}")
-                    return
-                
-                setattr(plugin_instance, '_plugin_dir', plugin_dir)
-                setattr(plugin_instance, '_actual_name', actual_name)
-                setattr(plugin_instance, '_directory_name', plugin_name)
-                setattr(plugin_instance, '_enabled', not is_disabled)
-                
-                self.plugins.append(plugin_instance)
-                if not is_disabled:
-                    for callback in plugin_instance.callbacks:
-                        if callback.enabled:
-                            self.callbacks[callback.position].append(callback)
-                status = "disabled" if is_disabled else "enabled"
-                self.logger.info(f"Successfully loaded plugin: {plugin_instance.metadata.name} ({status})")
-                
-            finally:
-                if str(plugin_dir) in sys.path:
-                    sys.path.remove(str(plugin_dir))
-                    
+            setattr(plugin_instance, '_module', module)
+            return plugin_instance
+            
+        finally:
+            if path_added and str(plugin_dir) in sys.path:
+                sys.path.remove(str(plugin_dir))
+    
+    @staticmethod
+    def _tag_plugin(plugin: Plugin, plugin_dir: Path, actual_name: str) -> None:
+        """
+        Attach the manager's bookkeeping attributes to a loaded plugin.
+        """
+        setattr(plugin, '_plugin_dir', plugin_dir)
+        setattr(plugin, '_actual_name', actual_name)
+        setattr(plugin, '_directory_name', plugin_dir.name)
+        setattr(plugin, '_enabled', not plugin_dir.name.endswith('.disabled'))
+        # Snapshot the abstract property so registration and removal see the same objects
+        setattr(plugin, '_callbacks_cached', tuple(plugin.callbacks))
+    
+    def _import_stubbed_plugin(self, stub: Plugin) -> Plugin | None:
+        """
+        Import the real plugin behind a disabled stub and swap it in place of the stub.
+        """
+        actual_name = getattr(stub, '_actual_name', stub.metadata.name)
+        plugin_dir = self.plugins_dir / getattr(stub, '_directory_name', actual_name)
+        try:
+            plugin = self._import_plugin(plugin_dir, actual_name)
         except Exception as e:
             self.logger.error(f"Failed to load plugin {actual_name}: {e}")
+            return None
+        if plugin is None:
+            return None
+        
+        self._tag_plugin(plugin, plugin_dir, actual_name)
+        self.plugins[self.plugins.index(stub)] = plugin
+        if self._plugins_by_name.get(stub.metadata.name) is stub:
+            del self._plugins_by_name[stub.metadata.name]
+        self._plugins_by_name.setdefault(plugin.metadata.name, plugin)
+        self.logger.info(f"Imported plugin {plugin.metadata.name} on enable")
+        return plugin
     
     def initialize_plugins(self, context: CallbackContext) -> None:
         """
@@ -157,7 +291,7 @@ class PluginManager:
                 if not plugin.initialize(context):
                     self.logger.warning(f"Plugin {plugin.metadata.name} initialization failed")
                 else:
-                    self.logger.debug(f"Plugin {plugin.metadata.name} initialized successfully")
+                    self.logger.debug("Plugin %s initialized successfully", plugin.metadata.name)
             except Exception as e:
                 self.logger.error(f"Error initializing plugin {plugin.metadata.name}: {e}")
     
@@ -170,7 +304,7 @@ class PluginManager:
         for plugin in self.plugins:
             try:
                 plugin.shutdown(context)
-                self.logger.debug(f"Plugin {plugin.metadata.name} shut down successfully")
+                self.logger.debug("Plugin %s shut down successfully", plugin.metadata.name)
             except Exception as e:
                 self.logger.error(f"Error shutting down plugin {plugin.metadata.name}: {e}")
     
@@ -187,7 +321,7 @@ class PluginManager:
         if not callbacks:
             return
         
-        self.logger.debug(f"Triggering {len(callbacks)} callbacks for position {position.value}")
+        self.logger.debug("Triggering %s callbacks for position %s", len(callbacks), position.value)
         
         for callback in callbacks:
             if not callback.enabled:
@@ -196,7 +330,7 @@ class PluginManager:
             try:
                 result = callback(context)
                 if result is False:
-                    self.logger.debug(f"Callback {callback.__class__.__name__} stopped further processing")
+                    self.logger.debug("Callback %s stopped further processing", callback.__class__.__name__)
                     break
             except Exception as e:
                 self.logger.error(f"Error in callback {callback.__class__.__name__}: {e}")
@@ -205,10 +339,7 @@ class PluginManager:
         """
         Get a plugin by name.
         """
-        for plugin in self.plugins:
-            if plugin.metadata.name == name:
-                return plugin
-        return None
+        return self._plugins_by_name.get(name)
     
     def is_plugin_enabled(self, plugin: Plugin) -> bool:
         """
@@ -261,28 +392,56 @@ class PluginManager:
             self.logger.error(f"Error renaming plugin directory for {name}: {e}")
             return False
     
+    @staticmethod
+    def _plugin_callbacks(plugin: Plugin) -> tuple[Callback, ...]:
+        """
+        Return the callbacks snapshotted when the plugin was loaded.
+        """
+        callbacks = getattr(plugin, '_callbacks_cached', None)
+        if callbacks is None:
+            callbacks = tuple(plugin.callbacks)
+            setattr(plugin, '_callbacks_cached', callbacks)
+        return callbacks
+    
+    def _unregister_callbacks(self, plugin: Plugin) -> None:
+        """
+        Remove all of a plugin's callbacks from the position lists.
+        """
+        plugin_callbacks = self._plugin_callbacks(plugin)
+        # Registration always uses the snapshot's objects, so identity is enough and skips any plugin __eq__
+        removal_ids = {id(cb) for cb in plugin_callbacks}
+        # Only the positions the plugin registered at can hold its callbacks
+        for position in {cb.position for cb in plugin_callbacks}:
+            if self.callbacks[position]:
+                self.callbacks[position] = [
+                    cb for cb in self.callbacks[position]
+                    if id(cb) not in removal_ids
+                ]
+    
     def _update_plugin_callbacks(self, plugin: Plugin, enabled: bool, context: CallbackContext | None = None):
         """
         Update callback registrations for a plugin.
         """
-        for position in CallbackPosition:
-            self.callbacks[position] = [
-                cb for cb in self.callbacks[position] 
-                if cb not in plugin.callbacks
-            ]
+        if enabled and isinstance(plugin, _DisabledPluginStub):
+            plugin = self._import_stubbed_plugin(plugin)
+            if plugin is None:
+                return
         
+        self._unregister_callbacks(plugin)
+        
+        module = getattr(plugin, '_module', None)
         if enabled:
-            for callback in plugin.callbacks:
+            if module is not None:
+                sys.modules.setdefault(module.__name__, module)  # Dropped when the plugin was disabled
+            # The lists are already sorted: insert in place (after equal priorities, like a stable sort)
+            for callback in self._plugin_callbacks(plugin):
                 if callback.enabled:
-                    self.callbacks[callback.position].append(callback)
-            
-            for position in CallbackPosition:
-                self.callbacks[position].sort(key=lambda cb: cb.priority)
+                    bisect.insort_right(self.callbacks[callback.position], callback, key=_callback_priority)
             
             if context:
                 try:
                     if plugin.initialize(context):
-                        launch_callbacks = [cb for cb in plugin.callbacks if cb.position == CallbackPosition.ON_LAUNCH]
+                        launch_callbacks = [cb for cb in self._plugin_callbacks(plugin) if cb.position == CallbackPosition.ON_LAUNCH]
                         for callback in launch_callbacks:
                             if callback.enabled:
                                 try:
@@ -296,7 +455,7 @@ class PluginManager:
         else:
             if context:
                 try:
-                    exit_callbacks = [cb for cb in plugin.callbacks if cb.position == CallbackPosition.ON_EXIT]
+                    exit_callbacks = [cb for cb in self._plugin_callbacks(plugin) if cb.position == CallbackPosition.ON_EXIT]
                     for callback in exit_callbacks:
                         if callback.enabled:
                             try:
@@ -307,15 +466,10 @@ class PluginManager:
                     plugin.shutdown(context)
                 except Exception as e:
                     self.logger.error(f"Error shutting down plugin {plugin.metadata.name}: {e}")
+            if module is not None:
+                _forget_plugin_modules(module.__name__)
     
-    def get_plugin_by_name(self, name: str) -> Plugin | None:
-        """
-        Get a plugin by its metadata name.
-        """
-        for plugin in self.plugins:
-            if plugin.metadata.name == name:
-                return plugin
-        return None
+    get_plugin_by_name = get_plugin  # Same metadata-name lookup, kept for existing callers
     
     def get_all_plugins_info(self) -> list[dict[str, Any]]:
         """
@@ -347,25 +501,25 @@ class PluginManager:
         """
         if not self.plugins_dir.exists():
             return {'new': [], 'deleted': [], 'renamed': []}
-        current_dirs = {d.name for d in self.plugins_dir.iterdir() 
-                       if d.is_dir() and not d.name.startswith('__')}
-        loaded_dirs = {getattr(plugin, '_directory_name', plugin.metadata.name) 
-                      for plugin in self.plugins}
-        def get_base_name(name):
-            return name[:-9] if name.endswith('.disabled') else name
-        current_base_names = {get_base_name(d): d for d in current_dirs}
-        loaded_base_names = {get_base_name(d): d for d in loaded_dirs}
-        new_base_names = set(current_base_names.keys()) - set(loaded_base_names.keys())
-        new_plugins = [current_base_names[base] for base in new_base_names]
-        deleted_base_names = set(loaded_base_names.keys()) - set(current_base_names.keys())
-        deleted_plugins = [loaded_base_names[base] for base in deleted_base_names]
+        loaded_base_names = {}
+        for plugin in self.plugins:
+            loaded_dir = getattr(plugin, '_directory_name', plugin.metadata.name)
+            loaded_base_names[_base_name(loaded_dir)] = loaded_dir
+        current_base_names = {}
+        with os.scandir(self.plugins_dir) as entries:
+            for entry in entries:
+                if not entry.name.startswith('__') and entry.is_dir():
+                    current_base_names[_base_name(entry.name)] = entry.name
+        new_plugins = []
         renamed_plugins = []
-        common_base_names = set(current_base_names.keys()) & set(loaded_base_names.keys())
-        for base_name in common_base_names:
-            current_dir = current_base_names[base_name]
-            loaded_dir = loaded_base_names[base_name]
-            if current_dir != loaded_dir:
+        for base_name, current_dir in current_base_names.items():
+            loaded_dir = loaded_base_names.get(base_name)
+            if loaded_dir is None:
+                new_plugins.append(current_dir)
+            elif loaded_dir != current_dir:
                 renamed_plugins.append((loaded_dir, current_dir))
+        deleted_plugins = [loaded_dir for base_name, loaded_dir in loaded_base_names.items()
+                           if base_name not in current_base_names]
         
         return {
             'new': new_plugins,
@@ -411,7 +565,7 @@ class PluginManager:
                 deleted_names.append(plugin.metadata.name)
                 if context:
                     try:
-                        exit_callbacks = [cb for cb in plugin.callbacks if cb.position == CallbackPosition.ON_EXIT]
+                        exit_callbacks = [cb for cb in self._plugin_callbacks(plugin) if cb.position == CallbackPosition.ON_EXIT]
                         for callback in exit_callbacks:
                             if callback.enabled:
                                 try:
@@ -423,13 +577,18 @@ class PluginManager:
                     except Exception as e:
                         self.logger.error(f"Error shutting down deleted plugin {plugin.metadata.name}: {e}")
                 
-                for position in CallbackPosition:
-                    self.callbacks[position] = [
-                        cb for cb in self.callbacks[position] 
-                        if cb not in plugin.callbacks
-                    ]
+                self._unregister_callbacks(plugin)
+                module = getattr(plugin, '_module', None)
+                if module is not None:
+                    _forget_plugin_modules(module.__name__)
                 
                 self.plugins.remove(plugin)
+                if self._plugins_by_name.get(plugin.metadata.name) is plugin:
+                    del self._plugins_by_name[plugin.metadata.name]
+                    for other in self.plugins:  # Fall back to a remaining plugin with the same name
+                        if other.metadata.name == plugin.metadata.name:
+                            self._plugins_by_name[other.metadata.name] = other
+                            break
                 self.logger.info(f"Removed deleted plugin: {plugin.metadata.name}")
         
         return deleted_names
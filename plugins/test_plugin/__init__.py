@@ -1,9 +1,6 @@
-import sys
-import os
-
-# Add parent directory to path to import interface
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+import functools
 
+# The host puts the application root on sys.path before loading plugins, so interface imports directly
 from interface import Plugin, Callback, CallbackPosition, CallbackContext, PluginMetadata, PluginSettings
 from typing import List, Optional
 
@@ -11,9 +8,12 @@ from typing import List, Optional
 class TestCallback(Callback):
     """Test callback that logs all events."""
     
+    __slots__ = ("_position", "_priority", "_log_message")
+    
     def __init__(self, position: CallbackPosition, priority: int = 100):
         self._position = position
         self._priority = priority
+        self._log_message = f"[TestPlugin] Triggered callback for {position.value}"
     
     @property
     def position(self) -> CallbackPosition:
@@ -25,46 +25,53 @@ class TestCallback(Callback):
     
     def __call__(self, context: CallbackContext) -> bool | None:
         if context.logger:
-            context.logger.info(f"[TestPlugin] Triggered callback for {self.position.value}")
+            context.logger.info(self._log_message)
         return None  # Continue processing other callbacks
 
 
+_METADATA = PluginMetadata(
+    name="Test Plugin",
+    version="1.0.0",
+    description="A simple test plugin to verify the plugin system",
+    author="System Test"
+)
+
+_SETTINGS = PluginSettings(
+    display_name="Test Plugin Settings",
+    description="Configuration options for the test plugin",
+    default_config={
+        "log_callbacks": True,
+        "priority_offset": 0,
+        "enabled_positions": ["on_launch", "on_exit", "on_input_box_show"]
+    }
+)
+
+# Positions the test plugin logs, with their priorities
+_CALLBACK_POSITIONS = (
+    (CallbackPosition.ON_LAUNCH, 100),
+    (CallbackPosition.ON_EXIT, 100),
+    (CallbackPosition.ON_INPUT_BOX_SHOW, 100),
+    (CallbackPosition.ON_INPUT_BOX_HIDE, 100),
+    (CallbackPosition.ON_HOTKEY_TRIGGERED, 100),
+    (CallbackPosition.ON_PASTE_IN_BOX, 100),
+    (CallbackPosition.ON_TEXT_CHANGED, 50),  # Higher priority
+)
+
+
 class TestPlugin(Plugin):
     """Simple test plugin."""
     
     @property
     def metadata(self) -> PluginMetadata:
-        return PluginMetadata(
-            name="Test Plugin",
-            version="1.0.0",
-            description="A simple test plugin to verify the plugin system",
-            author="System Test"
-        )
+        return _METADATA
     
     @property
     def settings(self) -> PluginSettings | None:
-        return PluginSettings(
-            display_name="Test Plugin Settings",
-            description="Configuration options for the test plugin",
-            default_config={
-                "log_callbacks": True,
-                "priority_offset": 0,
-                "enabled_positions": ["on_launch", "on_exit", "on_input_box_show"]
-            }
-        )
+        return _SETTINGS
     
-    @property
+    @functools.cached_property
     def callbacks(self) -> list[Callback]:
-        # Create callbacks for various positions
-        return [
-            TestCallback(CallbackPosition.ON_LAUNCH),
-            TestCallback(CallbackPosition.ON_EXIT),
-            TestCallback(CallbackPosition.ON_INPUT_BOX_SHOW),
-            TestCallback(CallbackPosition.ON_INPUT_BOX_HIDE),
-            TestCallback(CallbackPosition.ON_HOTKEY_TRIGGERED),
-            TestCallback(CallbackPosition.ON_PASTE_IN_BOX),
-            TestCallback(CallbackPosition.ON_TEXT_CHANGED, priority=50),  # Higher priority
-        ]
+        return [TestCallback(position, priority) for position, priority in _CALLBACK_POSITIONS]
     
     def initialize(self, context: CallbackContext) -> bool:
         if context.logger: